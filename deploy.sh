@@ -66,7 +66,7 @@ create_env_file() {
         print_status "Creating .env file..."
         cat > .env << EOF
 # JARVIS Environment Configuration
-OPENAI_API_KEY=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
+OPENAI_API_KEY=your_openrouter_api_key_here
 OPENWEATHER_API_KEY=your_weather_api_key_here
 NEWS_API_KEY=your_news_api_key_here
 
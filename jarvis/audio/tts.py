@@ -12,6 +12,9 @@ import numpy as np
 import logging
 import tempfile
 import os
+import re
+import queue
+import threading
 from typing import Optional, Union
 from pathlib import Path
 
@@ -31,6 +34,9 @@ from ..config.config import config
 
 logger = logging.getLogger(__name__)
 
+# Sentence boundaries used to pipeline synthesis with playback
+_SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+')
+
 class NeMoTTS:
     """NeMo-based Text-to-Speech"""
     
@@ -223,6 +229,51 @@ class TTSManager:
             logger.error(f"Failed to synthesize: {text}")
             return None
     
+    def speak_streaming(self, text: str) -> bool:
+        """Speak text sentence by sentence, synthesizing the next one while the current one plays"""
+        sentences = [s for s in _SENTENCE_SPLIT.split(text.strip()) if s.strip()]
+        if not sentences:
+            return False
+        if len(sentences) == 1:
+            return self.speak(sentences[0], play_audio=True) is not None
+        
+        # Producer thread synthesizes in order; this thread plays; None marks the end
+        ready: queue.Queue = queue.Queue()
+        
+        def produce():
+            try:
+                for i, sentence in enumerate(sentences):
+                    temp_file = os.path.join(
+                        self.temp_dir, f"tts_{threading.get_ident()}_{i}.wav"
+                    )
+                    if self.tts.synthesize_to_file(sentence, temp_file):
+                        ready.put(temp_file)
+                    else:
+                        logger.error(f"Failed to synthesize: {sentence}")
+            finally:
+                ready.put(None)
+        
+        producer = threading.Thread(target=produce, name="JARVIS-TTS-Synth", daemon=True)
+        producer.start()
+        
+        played = False
+        while True:
+            temp_file = ready.get()
+            if temp_file is None:
+                break
+            try:
+                self._play_audio(temp_file)
+            finally:
+                # Chunk files are single-use; remove each once it has played
+                try:
+                    os.unlink(temp_file)
+                except OSError as e:
+                    logger.warning(f"Could not remove TTS chunk {temp_file}: {e}")
+            played = True
+        
+        producer.join()
+        return played
+    
     def synthesize(self, text: str) -> Optional[np.ndarray]:
         """Synthesize text to audio data without playing"""
         return self.tts.synthesize_to_audio(text)
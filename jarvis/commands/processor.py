@@ -446,7 +446,7 @@ class CommandProcessor:
 
             # Check recent conversations for context
             if self.memory_manager:
-                recent_conversations = self.memory_manager.get_recent_conversations(limit=3)
+                recent_conversations = self.memory_manager.get_recent_conversations(limit=3, parse_context=False)
                 if recent_conversations:
                     last_command = recent_conversations[0]['user_input'].lower()
                     if 'weather' in last_command:
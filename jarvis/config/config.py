@@ -142,6 +142,23 @@ class JARVISConfig:
 # Global configuration instance
 config = JARVISConfig()
 
+# Frozen once a component has bound values from the config
+_config_frozen = False
+
+def _bind_audio_constants() -> None:
+    """Bind hot audio settings as module-level constants"""
+    global AUDIO_VAD_THRESHOLD, AUDIO_SILENCE_DURATION, AUDIO_MIN_RECORDING_DURATION
+    AUDIO_VAD_THRESHOLD = config.audio.vad_threshold
+    AUDIO_SILENCE_DURATION = config.audio.silence_duration
+    AUDIO_MIN_RECORDING_DURATION = config.audio.min_recording_duration
+
+_bind_audio_constants()
+
+def freeze_config() -> None:
+    """Mark the configuration as immutable; later updates raise"""
+    global _config_frozen
+    _config_frozen = True
+
 def load_config(config_file: Optional[str] = None) -> JARVISConfig:
     """Load configuration from file or environment"""
     if config_file and os.path.exists(config_file):
@@ -153,6 +170,9 @@ def load_config(config_file: Optional[str] = None) -> JARVISConfig:
 def update_config(**kwargs) -> None:
     """Update configuration values"""
     global config
+    if _config_frozen:
+        raise RuntimeError("Configuration is frozen and cannot be updated after boot")
     for key, value in kwargs.items():
         if hasattr(config, key):
             setattr(config, key, value)
+    _bind_audio_constants()
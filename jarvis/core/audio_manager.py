@@ -6,21 +6,36 @@ import time
 import threading
 import logging
 import queue
-import numpy as np
-# Optional dependency: pyaudio might be unavailable in CI/minimal envs
-try:
-    import pyaudio  # type: ignore
-except Exception:  # pragma: no cover
-    pyaudio = None  # type: ignore
 from typing import Optional, Callable, Dict, Any
 from dataclasses import dataclass
 from enum import Enum
 
-from ..config.config import config
+from ..config import config as config_module
 from .task_queue import task_queue, TaskType, TaskPriority
 
 logger = logging.getLogger(__name__)
 
+# Heavy dependencies are imported on first use so non-audio entry points don't pay for them.
+# pyaudio is optional and might be unavailable in CI/minimal envs.
+pyaudio = None  # type: ignore
+np = None  # type: ignore
+
+_PA_INT16 = 8  # Value of pyaudio.paInt16
+
+def _import_audio_deps() -> bool:
+    """Import numpy and pyaudio on first use; returns False if pyaudio is unavailable"""
+    global pyaudio, np
+    if np is None:
+        import numpy
+        np = numpy
+    if pyaudio is None:
+        try:
+            import pyaudio as pyaudio_module  # type: ignore
+        except Exception:  # pragma: no cover
+            return False
+        pyaudio = pyaudio_module
+    return True
+
 class AudioState(Enum):
     """Audio system states"""
     STOPPED = "stopped"
@@ -37,7 +52,7 @@ class AudioConfig:
     sample_rate: int = 16000
     channels: int = 1
     chunk_size: int = 1024
-    format: int = getattr(pyaudio, "paInt16", 8) if pyaudio else 8  # default fallback value
+    format: Optional[int] = None  # Resolved to paInt16 in __post_init__
     input_device_index: Optional[int] = None
     
     # Fallback configurations
@@ -45,6 +60,8 @@ class AudioConfig:
     fallback_chunk_sizes: list = None
     
     def __post_init__(self):
+        if self.format is None:
+            self.format = getattr(pyaudio, "paInt16", _PA_INT16)
         if self.fallback_sample_rates is None:
             self.fallback_sample_rates = [16000, 44100, 22050, 8000]
         if self.fallback_chunk_sizes is None:
@@ -60,18 +77,14 @@ class RobustAudioManager:
         # Audio system
         self.pyaudio_instance = None
         self.stream = None
-        self.state = AudioState.STOPPED if pyaudio else AudioState.DISABLED
-        
-        # Voice activity detection
-        self.vad_threshold = config.audio.vad_threshold
-        self.silence_duration = config.audio.silence_duration
-        self.min_recording_duration = config.audio.min_recording_duration
+        self.state = AudioState.STOPPED  # Becomes DISABLED if pyaudio fails to import
         
         # Recording state
         self.current_recording = []
         self.recording_start_time = 0
         self.last_voice_time = 0
         self.is_recording = False
+        self._silent_count = 0
         
         # Threading
         self.audio_thread = None
@@ -96,17 +109,30 @@ class RobustAudioManager:
             'uptime_start': time.time()
         }
         
-        # Thread safety
-        self.lock = threading.RLock()
+        # Thread safety (guards compound state transitions only)
+        self.lock = threading.Lock()
         
         logger.info("RobustAudioManager initialized")
     
+    # Voice activity settings are read from the config module on every use, so values
+    # rebound by update_config() reach a running manager
+    @property
+    def vad_threshold(self) -> float:
+        return config_module.AUDIO_VAD_THRESHOLD
+    
+    @property
+    def silence_duration(self) -> float:
+        return config_module.AUDIO_SILENCE_DURATION
+    
+    @property
+    def min_recording_duration(self) -> float:
+        return config_module.AUDIO_MIN_RECORDING_DURATION
+    
     def initialize(self) -> bool:
         """Initialize audio system with retry logic"""
-        if pyaudio is None:
+        if not _import_audio_deps():
             logger.warning("PyAudio not available. Audio subsystem disabled.")
-            with self.lock:
-                self.state = AudioState.DISABLED
+            self.state = AudioState.DISABLED
             return False
         
         with self.lock:
@@ -132,9 +158,8 @@ class RobustAudioManager:
             if not self._test_audio_input():
                 raise RuntimeError("Audio input test failed")
             
-            with self.lock:
-                self.state = AudioState.READY
-                self.initialization_attempts = 0
+            self.state = AudioState.READY
+            self.initialization_attempts = 0
             
             logger.info("Audio system initialized successfully")
             return True
@@ -142,8 +167,7 @@ class RobustAudioManager:
         except Exception as e:
             logger.error(f"Audio initialization failed: {e}")
             
-            with self.lock:
-                self.state = AudioState.ERROR
+            self.state = AudioState.ERROR
             
             # Schedule retry if not exceeded max attempts
             if self.initialization_attempts < self.max_init_attempts:
@@ -164,23 +188,27 @@ class RobustAudioManager:
     
     def start_listening(self) -> bool:
         """Start voice listening with error handling"""
-        if pyaudio is None:
+        if not _import_audio_deps():
             logger.warning("PyAudio not available. Cannot start listening.")
             return False
         
         with self.lock:
-            if self.state not in [AudioState.READY, AudioState.STOPPED]:
-                if self.state == AudioState.ERROR:
-                    logger.info("Attempting to recover from error state")
-                    if not self._attempt_recovery():
-                        return False
-                else:
-                    logger.warning(f"Cannot start listening in state: {self.state}")
+            state = self.state
+            running = self.running
+        
+        # Recovery re-enters initialize(), so it must run outside the (non-reentrant) lock
+        if state not in [AudioState.READY, AudioState.STOPPED]:
+            if state == AudioState.ERROR:
+                logger.info("Attempting to recover from error state")
+                if not self._attempt_recovery():
                     return False
-            
-            if self.running:
-                logger.warning("Audio listening already running")
-                return True
+            else:
+                logger.warning(f"Cannot start listening in state: {state}")
+                return False
+        
+        if running:
+            logger.warning("Audio listening already running")
+            return True
         
         try:
             # Create audio stream
@@ -214,18 +242,16 @@ class RobustAudioManager:
             # Start audio stream
             self.stream.start_stream()
             
-            with self.lock:
-                self.state = AudioState.LISTENING
+            self.state = AudioState.LISTENING
             
             logger.info("Voice listening started")
             return True
             
         except Exception as e:
             logger.error(f"Failed to start voice listening: {e}")
-            self._cleanup_audio_resources()
+            self._cleanup_stream()
             
-            with self.lock:
-                self.state = AudioState.ERROR
+            self.state = AudioState.ERROR
             
             # Attempt recovery
             self._attempt_recovery()
@@ -235,8 +261,7 @@ class RobustAudioManager:
         """Stop voice listening"""
         logger.info("Stopping voice listening")
         
-        with self.lock:
-            self.running = False
+        self.running = False
         
         # Stop audio stream
         if self.stream:
@@ -255,9 +280,9 @@ class RobustAudioManager:
         if self.processing_thread and self.processing_thread.is_alive():
             self.processing_thread.join(timeout=5.0)
         
-        with self.lock:
-            # If audio is disabled due to missing pyaudio, stay DISABLED; else STOPPED
-            self.state = AudioState.DISABLED if pyaudio is None else AudioState.STOPPED
+        # If audio is disabled due to missing pyaudio, stay DISABLED; else STOPPED
+        if self.state != AudioState.DISABLED:
+            self.state = AudioState.STOPPED
         
         logger.info("Voice listening stopped")
     
@@ -297,8 +322,11 @@ class RobustAudioManager:
             return False
         logger.debug("Finding working audio configuration")
         
+        # Prune unsupported sample rates with a capability query before opening any streams
+        sample_rates = self._get_supported_sample_rates()
+        
         # Try different sample rates
-        for sample_rate in self.config.fallback_sample_rates:
+        for sample_rate in sample_rates:
             for chunk_size in self.config.fallback_chunk_sizes:
                 try:
                     # Test configuration
@@ -332,6 +360,46 @@ class RobustAudioManager:
         logger.error("No working audio configuration found")
         return False
     
+    def _get_supported_sample_rates(self) -> list:
+        """Return candidate sample rates the input device reports as supported"""
+        candidates = list(self.config.fallback_sample_rates)
+        
+        try:
+            if self.config.input_device_index is not None:
+                device = self.pyaudio_instance.get_device_info_by_index(self.config.input_device_index)
+            else:
+                device = self.pyaudio_instance.get_default_input_device_info()
+        except Exception as e:
+            # No device info available; fall back to probing every candidate
+            logger.debug(f"Could not query audio device capabilities: {e}")
+            return candidates
+        
+        # Prefer the device's native rate when it is one of our candidates
+        default_rate = int(device.get('defaultSampleRate', 0))
+        if default_rate in candidates:
+            candidates.remove(default_rate)
+            candidates.insert(0, default_rate)
+        
+        supported = []
+        for sample_rate in candidates:
+            try:
+                if self.pyaudio_instance.is_format_supported(
+                    rate=sample_rate,
+                    input_device=device['index'],
+                    input_channels=self.config.channels,
+                    input_format=self.config.format
+                ):
+                    supported.append(sample_rate)
+            except ValueError as e:
+                logger.debug(f"Sample rate {sample_rate}Hz not supported: {e}")
+        
+        if not supported:
+            # Some host APIs under-report; keep the exhaustive search as a last resort
+            logger.debug("No sample rates reported as supported, probing all candidates")
+            return candidates
+        
+        return supported
+    
     def _test_audio_input(self) -> bool:
         """Test audio input functionality"""
         if pyaudio is None:
@@ -376,12 +444,9 @@ class RobustAudioManager:
             logger.warning(f"Audio callback status: {status}")
         
         try:
-            # Convert to numpy array
-            audio_data = np.frombuffer(in_data, dtype=np.int16)
-            
-            # Add to processing queue
+            # Queue raw bytes; VAD takes a short-lived int16 view when processing
             if not self.audio_queue.full():
-                self.audio_queue.put(audio_data, block=False)
+                self.audio_queue.put(in_data, block=False)
             else:
                 logger.warning("Audio queue full, dropping frame")
             
@@ -411,11 +476,12 @@ class RobustAudioManager:
         
         logger.info("Audio processing loop stopped")
     
-    def _process_audio_chunk(self, audio_chunk: np.ndarray):
-        """Process a single audio chunk"""
+    def _process_audio_chunk(self, audio_chunk: bytes):
+        """Process a single raw int16 audio chunk"""
         # Voice Activity Detection
-        if self._detect_voice_activity(audio_chunk):
+        if self._detect_voice_activity(np.frombuffer(audio_chunk, dtype=np.int16)):
             self.last_voice_time = time.time()
+            self._silent_count = 0
             
             # Start new recording if not already recording
             if not self.is_recording:
@@ -428,38 +494,51 @@ class RobustAudioManager:
         
         # Check if we should stop recording
         elif self.is_recording:
-            silence_time = time.time() - self.last_voice_time
-            recording_duration = time.time() - self.recording_start_time
+            # Count silent chunks instead of measuring wall-clock silence
+            self._silent_count += 1
+            if self._silent_count < self._compute_silent_chunks_needed():
+                return
             
-            if (silence_time >= self.silence_duration and 
-                recording_duration >= self.min_recording_duration):
+            recording_duration = time.time() - self.recording_start_time
+            if recording_duration >= self.min_recording_duration:
                 
                 logger.debug("Silence detected, processing speech")
                 self._finalize_recording()
     
-    def _detect_voice_activity(self, audio_chunk: np.ndarray) -> bool:
+    def _compute_silent_chunks_needed(self) -> int:
+        """Number of consecutive silent chunks that make up silence_duration"""
+        return max(1, int(self.silence_duration * self.config.sample_rate / self.config.chunk_size))
+    
+    def _detect_voice_activity(self, audio_chunk: 'np.ndarray') -> bool:
         """Detect voice activity in audio chunk"""
-        # Calculate RMS energy
-        rms = np.sqrt(np.mean(audio_chunk.astype(np.float32) ** 2))
-        return rms > self.vad_threshold * 32767  # Scale threshold for int16
+        # Decimate by 2 for VAD only; the voice band fits well below the halved Nyquist
+        a = audio_chunk[::2].astype(np.float32)
+        if a.size == 0:
+            return False
+        
+        # Compare mean energy against the squared int16 threshold (avoids sqrt and the divide)
+        thresh_sq = (config_module.AUDIO_VAD_THRESHOLD * 32767) ** 2
+        return float(np.dot(a, a)) > thresh_sq * a.size
     
     def _finalize_recording(self):
         """Finalize current recording and submit for processing"""
         if not self.current_recording:
             return
         
-        # Combine audio chunks
-        audio_data = np.concatenate(self.current_recording)
+        # Combine raw chunks with a single join, then view as int16
+        audio_data = np.frombuffer(b"".join(self.current_recording), dtype=np.int16)
         
         # Reset recording state
         self.is_recording = False
         self.current_recording = []
+        self._silent_count = 0
         
-        # Update statistics
-        with self.lock:
-            self.stats['total_recordings'] += 1
+        # Update statistics (single increments need no lock)
+        self.stats['total_recordings'] += 1
         
-        # Submit for speech processing
+        # Submit for speech processing. The task queue runs on worker threads, so the
+        # array is handed off by reference; frombuffer over immutable bytes keeps it
+        # read-only, making it safe to share without a copy.
         task_queue.submit_task(
             TaskType.VOICE_COMMAND,
             self._process_speech_data,
@@ -470,7 +549,7 @@ class RobustAudioManager:
             timeout=30.0
         )
     
-    def _process_speech_data(self, audio_data: np.ndarray):
+    def _process_speech_data(self, audio_data: 'np.ndarray'):
         """Process speech data (runs in task queue)"""
         if self.speech_callback:
             return self.speech_callback(audio_data)
@@ -478,14 +557,12 @@ class RobustAudioManager:
     
     def _on_speech_success(self, result):
         """Handle successful speech processing"""
-        with self.lock:
-            self.stats['successful_recordings'] += 1
+        self.stats['successful_recordings'] += 1
         logger.debug("Speech processing completed successfully")
     
     def _on_speech_error(self, error):
         """Handle speech processing error"""
-        with self.lock:
-            self.stats['failed_recordings'] += 1
+        self.stats['failed_recordings'] += 1
         logger.error(f"Speech processing failed: {error}")
     
     def _speech_processing_loop(self):
@@ -516,16 +593,16 @@ class RobustAudioManager:
         logger.info(f"Attempting audio system recovery (attempt {self.recovery_attempts})")
         
         try:
-            # Cleanup existing resources
-            self._cleanup_audio_resources()
+            # Close the stream but keep the PyAudio instance; re-initializing
+            # PortAudio re-enumerates devices and is slow
+            self._cleanup_stream()
             
             # Wait a moment
             time.sleep(1.0)
             
             # Reinitialize
             if self.initialize():
-                with self.lock:
-                    self.recovery_attempts = 0
+                self.recovery_attempts = 0
                 logger.info("Audio system recovery successful")
                 return True
             else:
@@ -542,6 +619,11 @@ class RobustAudioManager:
     
     def _cleanup_audio_resources(self):
         """Cleanup audio resources"""
+        self._cleanup_stream()
+        self._cleanup_pyaudio()
+    
+    def _cleanup_stream(self):
+        """Close the audio stream, keeping the PyAudio instance alive"""
         if self.stream:
             try:
                 if getattr(self.stream, "is_active", lambda: False)():
@@ -551,7 +633,9 @@ class RobustAudioManager:
                 logger.error(f"Error cleaning up audio stream: {e}")
             finally:
                 self.stream = None
-        
+    
+    def _cleanup_pyaudio(self):
+        """Terminate the PyAudio instance (final teardown only)"""
         if self.pyaudio_instance:
             try:
                 self.pyaudio_instance.terminate()
@@ -5,24 +5,63 @@ JARVIS Robust Camera Manager - Reliable camera access with frame buffering and r
 import time
 import threading
 import logging
-import queue
+import json
+import itertools
+import random
+from multiprocessing import shared_memory
 # Optional dependency: OpenCV might be unavailable in CI/minimal envs
 try:
     import cv2  # type: ignore
 except Exception:  # pragma: no cover
     cv2 = None  # type: ignore
+# Optional dependency: libjpeg-turbo bindings encode preview JPEGs faster than OpenCV
+try:
+    from turbojpeg import TurboJPEG  # type: ignore
+except Exception:  # pragma: no cover
+    TurboJPEG = None  # type: ignore
 import numpy as np
 from typing import Optional, Callable, Dict, Any, List
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
 import os
+import sys
 
 from ..config.config import config
 from .task_queue import task_queue, TaskType, TaskPriority
 
 logger = logging.getLogger(__name__)
 
+def _native_backend() -> int:
+    """Platform-native VideoCapture backend, avoiding OpenCV's serial CAP_ANY probe"""
+    if sys.platform.startswith('linux'):
+        return cv2.CAP_V4L2
+    if sys.platform == 'win32':
+        return cv2.CAP_DSHOW
+    if sys.platform == 'darwin':
+        return cv2.CAP_AVFOUNDATION
+    return cv2.CAP_ANY
+
+_BACKEND = _native_backend() if cv2 is not None else 0
+
+_PHOTO_SUFFIXES = ('.jpg', '.jpeg', '.png')
+
+# Drivers often substitute the nearest supported resolution; accept probes this close
+_RESOLUTION_TOLERANCE = 16
+
+def _backoff_delay(base: float, attempt: int, cap: float = 30.0) -> float:
+    """Exponential backoff with jitter so retries against the device don't synchronize"""
+    delay = min(base * (2 ** max(attempt - 1, 0)), cap)
+    return random.uniform(delay * 0.5, delay * 1.5)
+
+def _open_capture(camera_index: int):
+    """Open a VideoCapture with the native backend, falling back to CAP_ANY"""
+    capture = cv2.VideoCapture(camera_index, _BACKEND)
+    if capture.isOpened() or _BACKEND == cv2.CAP_ANY:
+        return capture
+    capture.release()
+    return cv2.VideoCapture(camera_index, cv2.CAP_ANY)
+
 class CameraState(Enum):
     """Camera system states"""
     STOPPED = "stopped"
@@ -40,6 +79,9 @@ class CameraConfig:
     width: int = 640
     height: int = 480
     fps: int = 30
+    throttle_fps: bool = False  # Pace reads in software; read() already blocks at the driver rate
+    use_shared_memory: bool = False  # Back the frame pool with shared memory for other processes
+    preview_enabled: bool = False  # Downscale every frame up front; otherwise previews are built on request
     
     # Fallback configurations
     fallback_indices: List[int] = None
@@ -64,6 +106,62 @@ class CameraFrame:
     frame_id: int
     width: int
     height: int
+    slot: int = -1  # Frame pool slot holding the pixels, or -1 if not pooled
+
+def attach_reader(name: str, slot: int, shape: tuple):
+    """Attach to a camera frame pool in shared memory from another process.
+    
+    Returns (shm, frame) where frame is a read-only view of the given pool slot.
+    Keep shm referenced while using the frame and close() it when done.
+    """
+    shm = shared_memory.SharedMemory(name=name)
+    frame_bytes = int(np.prod(shape))
+    frame = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf, offset=slot * frame_bytes)
+    frame.flags.writeable = False
+    return shm, frame
+
+class _RingBuffer:
+    """Fixed-size single-producer ring buffer that overwrites the oldest entry when full.
+    
+    Lock-free: the producer writes the slot before publishing the new head, and
+    index updates are single reference stores (atomic under the GIL). A consumer
+    racing an overwrite may receive a newer frame than the one it raced for, which
+    is harmless for frame data.
+    """
+    
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._slots: List[Any] = [None] * maxsize
+        self._head = 0  # Next write position (producer only)
+        self._tail = 0  # Oldest unread position
+    
+    def put(self, item: Any):
+        """Add an item, dropping the oldest one if the buffer is full"""
+        head = self._head
+        self._slots[head % self.maxsize] = item
+        if head - self._tail >= self.maxsize:
+            self._tail = head - self.maxsize + 1
+        self._head = head + 1
+    
+    def get(self) -> Optional[Any]:
+        """Remove and return the oldest item, or None if empty"""
+        tail = self._tail
+        if tail >= self._head:
+            return None
+        item = self._slots[tail % self.maxsize]
+        self._tail = tail + 1
+        return item
+    
+    def latest(self) -> Optional[Any]:
+        """Return the newest item without removing it"""
+        head = self._head
+        if head == 0:
+            return None
+        return self._slots[(head - 1) % self.maxsize]
+    
+    def qsize(self) -> int:
+        """Number of unread items"""
+        return max(0, min(self._head - self._tail, self.maxsize))
 
 class RobustCameraManager:
     """Robust camera manager with frame buffering and automatic recovery"""
@@ -76,9 +174,24 @@ class RobustCameraManager:
         self.state = CameraState.STOPPED if cv2 is not None else CameraState.DISABLED
         
         # Frame buffering
-        self.frame_buffer = queue.Queue(maxsize=30)  # 1 second at 30fps
-        self.current_frame = None
-        self.frame_counter = 0
+        self.frame_buffer = _RingBuffer(maxsize=30)  # 1 second at 30fps
+        self.current_frame = None  # Published by reference swap; readers take no lock
+        self._frame_ids = itertools.count()
+        
+        # Preallocated frames reused by the capture loop; sized so a slot is not
+        # rewritten while it can still be in the buffer or held by a consumer
+        self._frame_pool: List[np.ndarray] = []
+        self._pool_index = 0
+        self._shm: Optional[shared_memory.SharedMemory] = None
+        
+        # Optional downstream frame processing, submitted to the task queue in batches
+        self._frame_processor: Optional[Callable[[List[CameraFrame]], Any]] = None
+        self._batch_size = 4
+        self._pending_batch: List[CameraFrame] = []
+        
+        # Half-resolution previews, pooled alongside the full frames
+        self.current_preview: Optional[np.ndarray] = None
+        self._preview_pool: List[np.ndarray] = []
         
         # Threading
         self.capture_thread = None
@@ -91,6 +204,9 @@ class RobustCameraManager:
         self.max_recovery_attempts = 3
         self.last_error_time = 0
         self.error_cooldown = 5.0  # seconds
+        self.retry_reset_window = 60.0  # seconds without failures before attempt counters reset
+        self._last_init_failure_time = 0
+        self._known_good_config: Optional[tuple] = None  # (index, width, height, fps)
         
         # Statistics
         self.stats = {
@@ -103,6 +219,10 @@ class RobustCameraManager:
             'fps_actual': 0.0
         }
         
+        # Cached status config, see _config_snapshot()
+        self._static_config_key: Optional[tuple] = None
+        self._static_config_snapshot: Dict[str, Any] = {}
+        
         # FPS calculation
         self.fps_counter = 0
         self.fps_start_time = time.time()
@@ -114,6 +234,23 @@ class RobustCameraManager:
         self.photos_dir = Path("jarvis/photos")
         self.photos_dir.mkdir(exist_ok=True)
         
+        # Encoder parameters built once and reused for every photo
+        self._jpeg_params = (
+            [cv2.IMWRITE_JPEG_QUALITY, 90, cv2.IMWRITE_JPEG_OPTIMIZE, 1] if cv2 is not None else []
+        )
+        
+        # JPEG of the latest frame for stream/preview callers, as (frame_id, bytes)
+        self._jpeg_cache: Optional[tuple] = None
+        self._jpeg_encoder = None
+        if TurboJPEG is not None:
+            try:
+                self._jpeg_encoder = TurboJPEG()
+            except Exception as e:
+                logger.debug(f"TurboJPEG unavailable, using OpenCV for JPEG encoding: {e}")
+        
+        # Last working camera configuration, reused across restarts
+        self._config_cache = self.photos_dir.parent / ".camera_config.json"
+        
         logger.info("RobustCameraManager initialized")
     
     def initialize(self) -> bool:
@@ -129,13 +266,17 @@ class RobustCameraManager:
                 return False
             
             self.state = CameraState.INITIALIZING
+            
+            # Failures spread far apart are not a retry streak; start counting afresh
+            if time.time() - self._last_init_failure_time > self.retry_reset_window:
+                self.initialization_attempts = 0
             self.initialization_attempts += 1
         
         logger.info(f"Initializing camera system (attempt {self.initialization_attempts})")
         
         try:
-            # Find working camera configuration
-            if not self._find_working_camera_config():
+            # Reuse the cached configuration if it still works, else run the full probe
+            if not self._load_cached_camera_config() and not self._find_working_camera_config():
                 raise RuntimeError("No working camera configuration found")
             
             # Test camera capture
@@ -145,6 +286,9 @@ class RobustCameraManager:
             with self.lock:
                 self.state = CameraState.READY
                 self.initialization_attempts = 0
+                self._known_good_config = (
+                    self.config.camera_index, self.config.width, self.config.height, self.config.fps
+                )
             
             logger.info("Camera system initialized successfully")
             return True
@@ -154,11 +298,12 @@ class RobustCameraManager:
             
             with self.lock:
                 self.state = CameraState.ERROR
+                self._last_init_failure_time = time.time()
             
             # Schedule retry if not exceeded max attempts
             if self.initialization_attempts < self.max_init_attempts:
-                retry_delay = min(2 ** self.initialization_attempts, 30)  # Exponential backoff
-                logger.info(f"Retrying camera initialization in {retry_delay}s")
+                retry_delay = _backoff_delay(self.error_cooldown, self.initialization_attempts)
+                logger.info(f"Retrying camera initialization in {retry_delay:.1f}s")
                 
                 task_queue.submit_task(
                     TaskType.CAMERA_INIT,
@@ -193,15 +338,15 @@ class RobustCameraManager:
         
         try:
             # Open camera
-            self.camera = cv2.VideoCapture(self.config.camera_index)
+            self.camera = _open_capture(self.config.camera_index)
             
             if not self.camera.isOpened():
                 raise RuntimeError(f"Failed to open camera {self.config.camera_index}")
             
-            # Set camera properties
-            self.camera.set(cv2.CAP_PROP_FRAME_WIDTH, self.config.width)
-            self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, self.config.height)
-            self.camera.set(cv2.CAP_PROP_FPS, self.config.fps)
+            self._apply_capture_settings(self.camera)
+            logger.debug(f"Camera driver buffer size: {self.camera.get(cv2.CAP_PROP_BUFFERSIZE)}")
+            
+            self._allocate_frame_pool()
             
             # Start capture thread
             self.running = True
@@ -249,37 +394,114 @@ class RobustCameraManager:
         logger.info("Camera capture stopped")
     
     def get_current_frame(self) -> Optional[np.ndarray]:
-        """Get the most recent frame"""
-        with self.lock:
-            if self.current_frame is not None:
-                return self.current_frame.frame.copy()
-        return None
+        """Get the most recent frame as a read-only view.
+        
+        The view is not copied. It points into the capture frame pool and is only
+        guaranteed to hold this frame until the pool wraps around (one frame buffer's
+        worth of frames); use get_current_frame_copy() to keep or modify the frame.
+        """
+        current_frame = self.current_frame
+        if current_frame is None:
+            return None
+        
+        view = current_frame.frame.view()
+        view.flags.writeable = False
+        return view
+    
+    def set_frame_processor(self, processor: Optional[Callable[[List['CameraFrame']], Any]],
+                            batch_size: int = 4):
+        """Register a callback that receives captured frames in batches.
+        
+        Each batch of batch_size frames is submitted as one CAMERA_ANALYSIS task.
+        Frames point into the capture pool, so processors should copy anything they
+        keep beyond the call. Pass None to stop processing.
+        """
+        self._batch_size = max(1, batch_size)
+        self._pending_batch = []
+        self._frame_processor = processor
+    
+    def get_current_preview(self) -> Optional[np.ndarray]:
+        """Get the most recent half-resolution preview as a read-only view.
+        
+        Same validity contract as get_current_frame(); meant for status previews and
+        streams that don't need full resolution. With preview_enabled off the
+        preview is downscaled from the current frame on request.
+        """
+        if not self.config.preview_enabled:
+            frame = self.get_current_frame()
+            if frame is None or cv2 is None:
+                return None
+            height, width = frame.shape[:2]
+            preview = cv2.resize(frame, (width // 2, height // 2), interpolation=cv2.INTER_AREA)
+            preview.flags.writeable = False
+            return preview
+        
+        preview = self.current_preview
+        if preview is None:
+            return None
+        
+        view = preview.view()
+        view.flags.writeable = False
+        return view
+    
+    def get_current_frame_copy(self) -> Optional[np.ndarray]:
+        """Get a writable copy of the most recent frame"""
+        frame = self.get_current_frame()
+        return frame.copy() if frame is not None else None
+    
+    def get_current_jpeg(self, quality: int = 80) -> Optional[bytes]:
+        """Get the most recent frame as JPEG bytes, encoding each frame at most once"""
+        current_frame = self.current_frame
+        if current_frame is None:
+            return None
+        
+        cache_key = (current_frame.frame_id, quality)
+        cached = self._jpeg_cache
+        if cached is not None and cached[0] == cache_key:
+            return cached[1]
+        
+        if self._jpeg_encoder is not None:
+            data = self._jpeg_encoder.encode(current_frame.frame, quality=quality)
+        else:
+            ok, buffer = cv2.imencode('.jpg', current_frame.frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+            if not ok:
+                return None
+            data = buffer.tobytes()
+        
+        # Single reference swap; concurrent callers at worst encode the same frame twice
+        self._jpeg_cache = (cache_key, data)
+        return data
     
     def get_buffered_frame(self, max_age: float = 1.0) -> Optional['CameraFrame']:
-        """Get a recent frame from buffer"""
-        current_time = time.time()
+        """Get the newest buffered frame if it is recent enough (non-destructive)"""
+        frame = self.frame_buffer.latest()
+        if frame is None:
+            frame = self.current_frame
         
-        try:
-            # Try to get a recent frame from buffer
-            while not self.frame_buffer.empty():
-                frame = self.frame_buffer.get_nowait()
-                if current_time - frame.timestamp <= max_age:
-                    return frame
-            
-            # If no recent frame in buffer, return current frame
-            if self.current_frame and current_time - self.current_frame.timestamp <= max_age:
-                return self.current_frame
-                
-        except queue.Empty:
-            pass
+        if frame is not None and time.time() - frame.timestamp <= max_age:
+            return frame
         
         return None
     
-    def capture_photo(self, filename: Optional[str] = None, max_retries: int = 3) -> Optional[str]:
-        """Capture a photo with retry logic"""
+    def capture_photo(self, filename: Optional[str] = None, max_retries: int = 3,
+                      wait: bool = False) -> Optional[str]:
+        """Capture a photo with retry logic.
+        
+        The JPEG encode and file write run on the task queue and the path is returned
+        immediately; pass wait=True to write synchronously and confirm the file exists.
+        """
         if cv2 is None:
             logger.warning("OpenCV not available. Cannot capture photo.")
             return None
+        
+        # Resolve the target path once, outside the retry loop. Millisecond
+        # timestamps keep burst captures from colliding on the same name.
+        if filename is None:
+            filename = f"jarvis_photo_{time.time_ns() // 1_000_000}.jpg"
+        elif not filename.lower().endswith(_PHOTO_SUFFIXES):
+            filename += '.jpg'
+        filepath = str(self.photos_dir / filename)
+        
         for attempt in range(max_retries):
             try:
                 # Get a recent frame
@@ -294,30 +516,25 @@ class RobustCameraManager:
                 else:
                     frame = frame_data.frame
                 
-                # Generate filename if not provided
-                if filename is None:
-                    timestamp = int(time.time())
-                    filename = f"jarvis_photo_{timestamp}.jpg"
-                
-                # Ensure filename has extension
-                if not filename.lower().endswith(('.jpg', '.jpeg', '.png')):
-                    filename += '.jpg'
-                
-                filepath = self.photos_dir / filename
-                
-                # Save photo
-                success = cv2.imwrite(str(filepath), frame)
-                
-                if not success:
-                    raise RuntimeError("Failed to save photo")
+                if wait:
+                    self._write_photo(filepath, frame)
+                    self._on_photo_saved(filepath)
+                    return filepath
                 
-                # Update statistics
-                with self.lock:
-                    self.stats['photos_taken'] += 1
-                    self.stats['successful_captures'] += 1
+                # Copy once since the pooled frame buffer will be reused, then
+                # hand the encode + write off the caller's thread
+                task_queue.submit_task(
+                    TaskType.PHOTO_CAPTURE,
+                    self._write_photo,
+                    (filepath, frame.copy()),
+                    priority=TaskPriority.NORMAL,
+                    callback=self._on_photo_saved,
+                    error_callback=self._on_photo_error,
+                    max_retries=max_retries,
+                    timeout=10.0
+                )
                 
-                logger.info(f"Photo captured successfully: {filepath}")
-                return str(filepath)
+                return filepath
                 
             except Exception as e:
                 logger.warning(f"Photo capture attempt {attempt + 1} failed: {e}")
@@ -333,37 +550,98 @@ class RobustCameraManager:
         
         return None
     
+    def _write_photo(self, filepath: str, frame: np.ndarray) -> str:
+        """Encode and write a photo to disk (runs in task queue)"""
+        if filepath.lower().endswith('.png'):
+            ok, encoded = cv2.imencode('.png', frame)
+        else:
+            ok, encoded = cv2.imencode('.jpg', frame, self._jpeg_params)
+        if not ok:
+            raise RuntimeError("Failed to encode photo")
+        
+        # Write the encoded buffer directly, via a temp file so readers never see a partial photo
+        tmp_path = filepath + '.tmp'
+        data = memoryview(encoded).cast('B')
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            while data:
+                written = os.write(fd, data)
+                data = data[written:]
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, filepath)
+        return filepath
+    
+    def _on_photo_saved(self, filepath: str):
+        """Handle a successfully written photo"""
+        with self.lock:
+            self.stats['photos_taken'] += 1
+            self.stats['successful_captures'] += 1
+        logger.info(f"Photo captured successfully: {filepath}")
+    
+    def _on_photo_error(self, error):
+        """Handle a photo write that failed after all retries"""
+        with self.lock:
+            self.stats['failed_captures'] += 1
+        logger.error(f"Photo save failed: {error}")
+    
     def get_status(self) -> Dict[str, Any]:
         """Get camera system status"""
+        # Hold the lock only long enough to snapshot the mutable fields
         with self.lock:
-            uptime = time.time() - self.stats['uptime_start']
-            
-            return {
-                'state': self.state.value,
-                'available': self.state in [CameraState.READY, CameraState.CAPTURING],
-                'capturing': self.state == CameraState.CAPTURING,
-                'has_frame': self.current_frame is not None,
-                'config': {
-                    'camera_index': self.config.camera_index,
-                    'resolution': (self.config.width, self.config.height),
-                    'fps_target': self.config.fps,
-                    'fps_actual': self.stats['fps_actual']
-                },
-                'stats': {
-                    **self.stats,
-                    'uptime': uptime,
-                    'buffer_size': self.frame_buffer.qsize(),
-                    'success_rate': (
-                        self.stats['successful_captures'] / 
-                        max(self.stats['total_frames'], 1)
-                    )
-                }
+            state = self.state
+            stats = dict(self.stats)
+        
+        return {
+            'state': state.value,
+            'available': state in (CameraState.READY, CameraState.CAPTURING),
+            'capturing': state == CameraState.CAPTURING,
+            'has_frame': self.current_frame is not None,
+            'config': {
+                **self._config_snapshot(),
+                'fps_actual': stats['fps_actual']
+            },
+            'stats': {
+                **stats,
+                'uptime': time.time() - stats['uptime_start'],
+                'buffer_size': self.frame_buffer.qsize(),
+                'success_rate': (
+                    stats['successful_captures'] / 
+                    max(stats['total_frames'], 1)
+                )
             }
+        }
+    
+    def _config_snapshot(self) -> Dict[str, Any]:
+        """Static part of the status config, rebuilt only when the config changes"""
+        key = (self.config.camera_index, self.config.width, self.config.height, self.config.fps)
+        if self._static_config_key != key:
+            self._static_config_snapshot = {
+                'camera_index': key[0],
+                'resolution': (key[1], key[2]),
+                'fps_target': key[3]
+            }
+            self._static_config_key = key
+        return self._static_config_snapshot
     
     def cleanup(self):
         """Cleanup camera resources"""
         self.stop_capture()
         self._cleanup_camera_resources()
+        self._release_shared_frames()
+    
+    def get_shared_frame_info(self) -> Optional[Dict[str, Any]]:
+        """Describe the current frame's location in shared memory for attach_reader()"""
+        current_frame = self.current_frame
+        if self._shm is None or current_frame is None or current_frame.slot < 0:
+            return None
+        return {
+            'name': self._shm.name,
+            'slot': current_frame.slot,
+            'shape': current_frame.frame.shape,
+            'timestamp': current_frame.timestamp,
+            'frame_id': current_frame.frame_id
+        }
     
     def _find_working_camera_config(self) -> bool:
         """Find a working camera configuration"""
@@ -371,67 +649,119 @@ class RobustCameraManager:
             return False
         logger.debug("Finding working camera configuration")
         
-        # Try different camera indices
+        # Try the declared settings before the fallbacks
+        settings = [(self.config.width, self.config.height, self.config.fps)]
+        settings += [
+            (width, height, fps)
+            for width, height in self.config.fallback_resolutions
+            for fps in self.config.fallback_fps
+            if (width, height, fps) != settings[0]
+        ]
+        
+        # Try different camera indices, opening each one only once
+        probed = set()
         for camera_index in self.config.fallback_indices:
-            if camera_index == -1:
-                # Try to find any available camera
-                for i in range(10):  # Check first 10 indices
-                    if self._test_camera_index(i):
-                        self.config.camera_index = i
-                        break
-                else:
+            # -1 means try to find any available camera in the first 10 indices
+            candidates = range(10) if camera_index == -1 else [camera_index]
+            
+            for index in candidates:
+                if index in probed:
                     continue
-            else:
-                if not self._test_camera_index(camera_index):
+                probed.add(index)
+                
+                found = self._probe_index(index, settings)
+                if found is None:
                     continue
-                self.config.camera_index = camera_index
-            
-            # Try different resolutions
-            for width, height in self.config.fallback_resolutions:
-                for fps in self.config.fallback_fps:
-                    if self._test_camera_settings(camera_index, width, height, fps):
-                        self.config.width = width
-                        self.config.height = height
-                        self.config.fps = fps
-                        
-                        logger.info(f"Found working camera config: index={camera_index}, "
-                                  f"resolution={width}x{height}, fps={fps}")
-                        return True
+                
+                width, height, fps = found
+                self.config.camera_index = index
+                self.config.width = width
+                self.config.height = height
+                self.config.fps = fps
+                
+                logger.info(f"Found working camera config: index={index}, "
+                          f"resolution={width}x{height}, fps={fps}")
+                self._save_cached_camera_config()
+                return True
         
         logger.error("No working camera configuration found")
         return False
     
-    def _test_camera_index(self, camera_index: int) -> bool:
-        """Test if a camera index is available"""
+    def _load_cached_camera_config(self) -> bool:
+        """Apply the cached camera configuration if it still works"""
         try:
-            test_camera = cv2.VideoCapture(camera_index)
-            if test_camera.isOpened():
-                ret, frame = test_camera.read()
-                test_camera.release()
-                return ret and frame is not None
-        except Exception:
-            pass
-        return False
+            cached = json.loads(self._config_cache.read_text())
+            camera_index = int(cached['camera_index'])
+            width, height, fps = int(cached['width']), int(cached['height']), int(cached['fps'])
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+        
+        if not self._test_camera_settings(camera_index, width, height, fps):
+            logger.info("Cached camera config no longer works, probing")
+            return False
+        
+        self.config.camera_index = camera_index
+        self.config.width = width
+        self.config.height = height
+        self.config.fps = fps
+        logger.info(f"Using cached camera config: index={camera_index}, "
+                    f"resolution={width}x{height}, fps={fps}")
+        return True
     
-    def _test_camera_settings(self, camera_index: int, width: int, height: int, fps: int) -> bool:
-        """Test specific camera settings"""
+    def _save_cached_camera_config(self):
+        """Persist the working camera configuration"""
+        try:
+            self._config_cache.write_text(json.dumps({
+                'camera_index': self.config.camera_index,
+                'width': self.config.width,
+                'height': self.config.height,
+                'fps': self.config.fps
+            }))
+        except OSError as e:
+            logger.debug(f"Could not cache camera config: {e}")
+    
+    def _probe_index(self, camera_index: int, settings: List[tuple]) -> Optional[tuple]:
+        """Open a camera index once and return the first working (width, height, fps).
+        
+        The returned width/height are the resolution the driver actually delivered.
+        """
+        test_camera = None
         try:
-            test_camera = cv2.VideoCapture(camera_index)
+            test_camera = _open_capture(camera_index)
             if not test_camera.isOpened():
-                return False
+                return None
             
-            test_camera.set(cv2.CAP_PROP_FRAME_WIDTH, width)
-            test_camera.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
-            test_camera.set(cv2.CAP_PROP_FPS, fps)
+            test_camera.set(cv2.CAP_PROP_BUFFERSIZE, 1)
             
-            # Test capture
+            # Sanity check that the index delivers frames at all
             ret, frame = test_camera.read()
-            test_camera.release()
+            if not ret or frame is None:
+                return None
             
-            return ret and frame is not None and frame.shape[:2] == (height, width)
+            # Try each setting on the same open handle
+            for width, height, fps in settings:
+                test_camera.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+                test_camera.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+                test_camera.set(cv2.CAP_PROP_FPS, fps)
+                
+                ret, frame = test_camera.read()
+                if ret and frame is not None:
+                    actual_height, actual_width = frame.shape[:2]
+                    if (abs(actual_width - width) <= _RESOLUTION_TOLERANCE and
+                            abs(actual_height - height) <= _RESOLUTION_TOLERANCE):
+                        return (actual_width, actual_height, fps)
+            
+            return None
             
         except Exception:
-            return False
+            return None
+        finally:
+            if test_camera is not None:
+                test_camera.release()
+    
+    def _test_camera_settings(self, camera_index: int, width: int, height: int, fps: int) -> bool:
+        """Test specific camera settings"""
+        return self._probe_index(camera_index, [(width, height, fps)]) is not None
     
     def _test_camera_capture(self) -> bool:
         """Test camera capture functionality"""
@@ -440,16 +770,17 @@ class RobustCameraManager:
         try:
             logger.debug("Testing camera capture")
             
-            test_camera = cv2.VideoCapture(self.config.camera_index)
+            test_camera = _open_capture(self.config.camera_index)
             if not test_camera.isOpened():
                 return False
             
+            test_camera.set(cv2.CAP_PROP_BUFFERSIZE, 1)
             test_camera.set(cv2.CAP_PROP_FRAME_WIDTH, self.config.width)
             test_camera.set(cv2.CAP_PROP_FRAME_HEIGHT, self.config.height)
             test_camera.set(cv2.CAP_PROP_FPS, self.config.fps)
             
-            # Capture a few frames to test
-            for _ in range(5):
+            # The first frame from USB cameras is often garbage; the second is representative
+            for _ in range(2):
                 ret, frame = test_camera.read()
                 if not ret or frame is None:
                     test_camera.release()
@@ -477,59 +808,77 @@ class RobustCameraManager:
         
         while self.running:
             try:
-                current_time = time.time()
-                
-                # Maintain target FPS
-                elapsed = current_time - last_frame_time
-                if elapsed < frame_time:
-                    time.sleep(frame_time - elapsed)
+                # Only pace manually when throttling below the driver frame rate
+                if self.config.throttle_fps:
+                    elapsed = time.time() - last_frame_time
+                    if elapsed < frame_time:
+                        time.sleep(frame_time - elapsed)
                 
-                # Capture frame
-                ret, frame = self.camera.read()
+                # Capture frame into the next pooled buffer (OpenCV reallocates only
+                # if the driver returns a different frame size)
+                slot = self._pool_index
+                buf = self._frame_pool[slot]
+                self._pool_index = (slot + 1) % len(self._frame_pool)
+                ret, frame = self.camera.read(buf)
                 
                 if not ret or frame is None:
                     logger.warning("Failed to capture frame")
                     time.sleep(0.1)
                     continue
                 
+                # Single clock read per frame, shared by the timestamp and FPS math
+                now = time.time()
+                
                 # Create frame object
                 camera_frame = CameraFrame(
                     frame=frame,
-                    timestamp=time.time(),
-                    frame_id=self.frame_counter,
+                    timestamp=now,
+                    frame_id=next(self._frame_ids),
                     width=frame.shape[1],
-                    height=frame.shape[0]
+                    height=frame.shape[0],
+                    slot=slot if frame is buf else -1
                 )
                 
-                # Update current frame
-                with self.lock:
-                    self.current_frame = camera_frame
-                    self.frame_counter += 1
-                    self.stats['total_frames'] += 1
+                # Publish current frame; the capture thread is the only writer, so a
+                # plain reference store and stat increment need no lock
+                self.current_frame = camera_frame
+                self.stats['total_frames'] += 1
+                
+                # Downscale once here so preview consumers don't each resize the full frame
+                if self._preview_pool:
+                    height, width = frame.shape[:2]
+                    preview = self._preview_pool[slot] if frame is buf else None
+                    self.current_preview = cv2.resize(
+                        frame, (width // 2, height // 2), dst=preview, interpolation=cv2.INTER_AREA
+                    )
                 
-                # Add to buffer (remove old frames if full)
-                try:
-                    self.frame_buffer.put_nowait(camera_frame)
-                except queue.Full:
-                    # Remove oldest frame and add new one
-                    try:
-                        self.frame_buffer.get_nowait()
-                        self.frame_buffer.put_nowait(camera_frame)
-                    except queue.Empty:
-                        pass
+                # Add to buffer (overwrites the oldest frame if full)
+                self.frame_buffer.put(camera_frame)
+                
+                # Amortize task submission across a batch of frames
+                if self._frame_processor is not None:
+                    self._pending_batch.append(camera_frame)
+                    if len(self._pending_batch) >= self._batch_size:
+                        task_queue.submit_task(
+                            TaskType.CAMERA_ANALYSIS,
+                            self._frame_processor,
+                            (self._pending_batch,),
+                            priority=TaskPriority.NORMAL,
+                            max_retries=1
+                        )
+                        self._pending_batch = []
                 
                 # Update FPS calculation
                 self.fps_counter += 1
                 if self.fps_counter >= 30:  # Update every 30 frames
-                    fps_elapsed = time.time() - self.fps_start_time
+                    fps_elapsed = now - self.fps_start_time
                     if fps_elapsed > 0:
-                        with self.lock:
-                            self.stats['fps_actual'] = self.fps_counter / fps_elapsed
+                        self.stats['fps_actual'] = self.fps_counter / fps_elapsed
                     
                     self.fps_counter = 0
-                    self.fps_start_time = time.time()
+                    self.fps_start_time = now
                 
-                last_frame_time = time.time()
+                last_frame_time = now
                 
             except Exception as e:
                 logger.error(f"Error in camera capture loop: {e}")
@@ -542,6 +891,96 @@ class RobustCameraManager:
         
         logger.info("Camera capture loop stopped")
     
+    def _allocate_frame_pool(self):
+        """Preallocate capture buffers for the configured resolution"""
+        pool_size = self.frame_buffer.maxsize + 2
+        shape = (self.config.height, self.config.width, 3)
+        shared = self.config.use_shared_memory
+        preview_shape = (self.config.height // 2, self.config.width // 2, 3)
+        if not self.config.preview_enabled:
+            self._preview_pool = []
+        elif len(self._preview_pool) != pool_size or self._preview_pool[0].shape != preview_shape:
+            self._preview_pool = [np.empty(preview_shape, dtype=np.uint8) for _ in range(pool_size)]
+        
+        if (len(self._frame_pool) == pool_size and self._frame_pool[0].shape == shape
+                and (self._shm is not None) == shared):
+            self._pool_index = 0
+            return
+        
+        self._release_shared_frames()
+        if shared:
+            # One segment holding every slot; other processes map it by name
+            frame_bytes = int(np.prod(shape))
+            self._shm = shared_memory.SharedMemory(create=True, size=pool_size * frame_bytes)
+            self._frame_pool = [
+                np.ndarray(shape, dtype=np.uint8, buffer=self._shm.buf, offset=i * frame_bytes)
+                for i in range(pool_size)
+            ]
+        else:
+            self._frame_pool = [np.empty(shape, dtype=np.uint8) for _ in range(pool_size)]
+        self._pool_index = 0
+    
+    def _release_shared_frames(self):
+        """Unlink the shared-memory frame pool, if any"""
+        if self._shm is None:
+            return
+        shm, self._shm = self._shm, None
+        self._frame_pool = []
+        try:
+            shm.close()
+        except BufferError:
+            # Frames still referenced locally; the mapping is freed when they are dropped
+            pass
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+    
+    def _apply_capture_settings(self, capture):
+        """Apply the configured properties to an open capture"""
+        # Keep only the newest frame in the driver queue to avoid stale reads
+        capture.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        capture.set(cv2.CAP_PROP_FRAME_WIDTH, self.config.width)
+        capture.set(cv2.CAP_PROP_FRAME_HEIGHT, self.config.height)
+        capture.set(cv2.CAP_PROP_FPS, self.config.fps)
+    
+    def _reopen_camera(self) -> bool:
+        """Reopen the camera with the known-good configuration, skipping the probe"""
+        if self._known_good_config is None:
+            return False
+        
+        camera_index, width, height, fps = self._known_good_config
+        self.config.camera_index = camera_index
+        self.config.width = width
+        self.config.height = height
+        self.config.fps = fps
+        
+        camera = None
+        try:
+            camera = _open_capture(camera_index)
+            if not camera.isOpened():
+                camera.release()
+                return False
+            
+            self._apply_capture_settings(camera)
+            ret, frame = camera.read()
+            if not ret or frame is None:
+                camera.release()
+                return False
+            
+        except Exception as e:
+            logger.debug(f"Camera reopen failed: {e}")
+            if camera is not None:
+                camera.release()
+            return False
+        
+        # Hand the handle to a running capture loop; otherwise start_capture opens its own
+        if self.running:
+            self.camera = camera
+        else:
+            camera.release()
+        return True
+    
     def _attempt_recovery(self) -> bool:
         """Attempt to recover from error state"""
         if time.time() - self.last_error_time < self.error_cooldown:
@@ -549,6 +988,9 @@ class RobustCameraManager:
             return False
         
         with self.lock:
+            # Reset the streak if the last failure was long ago
+            if time.time() - self.last_error_time > self.retry_reset_window:
+                self.recovery_attempts = 0
             self.recovery_attempts += 1
             self.stats['recovery_count'] += 1
             
@@ -564,8 +1006,16 @@ class RobustCameraManager:
             # Cleanup existing resources
             self._cleanup_camera_resources()
             
-            # Wait a moment
-            time.sleep(1.0)
+            # Fast path: the working config is known, so only the handle needs reopening
+            if self._reopen_camera():
+                with self.lock:
+                    self.recovery_attempts = 0
+                    self.state = CameraState.CAPTURING if self.running else CameraState.READY
+                logger.info("Camera system recovery successful (reopened)")
+                return True
+            
+            # Back off before touching the device again
+            time.sleep(_backoff_delay(1.0, self.recovery_attempts))
             
             # Reinitialize
             if self.initialize():
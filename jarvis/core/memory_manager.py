@@ -6,19 +6,165 @@ import sqlite3
 import json
 import os
 import logging
+import queue
+import threading
+import time
+import atexit
+from collections import deque
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 from pathlib import Path
+# Optional dependency: orjson is much faster than the stdlib json module
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
 
 logger = logging.getLogger(__name__)
 
+def _dumps(obj: Any) -> Optional[str]:
+    """Serialize a context/event dict for storage, or None if empty"""
+    if not obj:
+        return None
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj)
+
+def _dumps_export(obj: Any) -> str:
+    """Serialize one exported conversation as indented JSON"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, indent=2, default=str)
+
+def _loads(data: Optional[str]) -> Any:
+    """Deserialize a stored context/event blob"""
+    if not data:
+        return None
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+# Statements executed by the background writer, keyed by write kind
+_WRITE_SQL = {
+    'conversation': '''
+        INSERT INTO conversations 
+        (user_input, jarvis_response, context, session_id, command_type, 
+         confidence, processing_time, success)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ''',
+    'preference': '''
+        INSERT OR REPLACE INTO user_preferences 
+        (preference_key, preference_value, description, updated_at)
+        VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+    ''',
+    'event': '''
+        INSERT INTO system_events (event_type, event_data, severity)
+        VALUES (?, ?, ?)
+    '''
+}
+
+# Conversation stats over a trailing window; bound as datetime('now', '-N days')
+_STATS_SQL = '''
+    SELECT COUNT(*), SUM(success), AVG(processing_time)
+    FROM conversations 
+    WHERE timestamp >= datetime('now', ?)
+'''
+
+_TOP_COMMAND_TYPES_SQL = '''
+    SELECT command_type, COUNT(*) as count 
+    FROM conversations 
+    WHERE command_type IS NOT NULL 
+    AND timestamp >= datetime('now', ?)
+    GROUP BY command_type 
+    ORDER BY count DESC 
+    LIMIT 5
+'''
+
+# Prompt context lines are formatted by SQLite, skipping the context column entirely
+_CONTEXT_SQL = '''
+    SELECT 'User: ' || user_input || char(10) || 'JARVIS: ' || jarvis_response
+    FROM conversations 
+    WHERE success = 1
+    ORDER BY timestamp DESC 
+    LIMIT ?
+'''
+
+_CONTEXT_SESSION_SQL = '''
+    SELECT 'User: ' || user_input || char(10) || 'JARVIS: ' || jarvis_response
+    FROM conversations 
+    WHERE session_id = ? AND success = 1
+    ORDER BY timestamp DESC 
+    LIMIT ?
+'''
+
+# Hot read statements compiled when a reader connection opens (LIMIT 0, no rows);
+# the statement cache is keyed by exact SQL text so these stay resident
+_WARM_STATEMENTS = (
+    (_CONTEXT_SQL, (0,)),
+    (_CONTEXT_SESSION_SQL, (None, 0))
+)
+
+# Per-connection tuning: WAL lets readers run alongside the writer and only
+# needs an fsync at checkpoints with synchronous=NORMAL
+_CONNECTION_PRAGMAS = (
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA cache_size=-20000',  # 20 MB
+    'PRAGMA mmap_size=268435456',  # 256 MB
+    'PRAGMA wal_autocheckpoint=1000'
+)
+
+# Prepared statements kept per connection; all SQL uses bound parameters
+_CACHED_STATEMENTS = 256
+
+# Writer batching: commit after this many rows or once this long has passed
+_WRITE_BATCH_ROWS = 256
+_WRITE_BATCH_WAIT = 0.1  # seconds
+
+# System events kept in memory, and the severities also written to SQLite
+_EVENT_RING_SIZE = 1000
+_PERSISTED_SEVERITIES = frozenset(('warning', 'error', 'critical'))
+
+# Rows removed per transaction by clear_old_conversations
+_DELETE_BATCH_ROWS = 1000
+
+# Rows fetched per round-trip when streaming an export
+_EXPORT_BATCH_ROWS = 1000
+
+# Queue markers for the writer thread
+_FLUSH = object()
+_STOP = object()
+
 class MemoryManager:
     """Manages conversation history and user preferences for JARVIS"""
     
     def __init__(self, db_path: str = "jarvis/memory/conversations.db"):
         self.db_path = db_path
+        self._local = threading.local()  # Per-thread reader connections, kept open
+        self._reader_conns: List[sqlite3.Connection] = []  # Every one of them, so close() can reach them
+        self._reader_conns_lock = threading.Lock()
+        
+        # Recent system events of every severity; only warnings and above are persisted
+        self._event_ring: deque = deque(maxlen=_EVENT_RING_SIZE)
+        
+        # Preferences change rarely; cached after first read and updated on write
+        self._pref_cache: Optional[Dict[str, str]] = None
+        self._pref_lock = threading.Lock()
+        
         self._ensure_memory_directory()
         self.init_database()
+        
+        # Writes are queued and committed in batches by a background thread
+        self._write_q: queue.Queue = queue.Queue()
+        self._writer_thread = threading.Thread(
+            target=self._writer_loop,
+            name="JARVIS-MemoryWriter",
+            daemon=True
+        )
+        self._writer_thread.start()
+        atexit.register(self.flush)
+        
         logger.info(f"Memory manager initialized with database: {self.db_path}")
     
     def _ensure_memory_directory(self):
@@ -26,9 +172,36 @@ class MemoryManager:
         memory_dir = Path(self.db_path).parent
         memory_dir.mkdir(parents=True, exist_ok=True)
     
+    def _connect(self, **kwargs) -> sqlite3.Connection:
+        """Open a tuned connection to the memory database"""
+        conn = sqlite3.connect(self.db_path, cached_statements=_CACHED_STATEMENTS, **kwargs)
+        for pragma in _CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+    
+    def _get_conn(self) -> sqlite3.Connection:
+        """Get this thread's long-lived autocommit connection, opening it on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._connect(check_same_thread=False, isolation_level=None)
+            self._prepare_statements(conn)
+            self._local.conn = conn
+            with self._reader_conns_lock:
+                self._reader_conns.append(conn)
+        return conn
+    
+    def _prepare_statements(self, conn: sqlite3.Connection):
+        """Compile the per-turn read queries into the connection's statement cache"""
+        try:
+            for sql, params in _WARM_STATEMENTS:
+                conn.execute(sql, params).fetchall()
+        except sqlite3.OperationalError:
+            # Tables don't exist yet on first start; init_database creates them
+            pass
+    
     def init_database(self):
         """Initialize SQLite database for conversation memory"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_conn()
         cursor = conn.cursor()
         
         # Conversations table
@@ -74,39 +247,47 @@ class MemoryManager:
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_conversations_timestamp ON conversations(timestamp)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_conversations_type ON conversations(command_type)')
         
-        conn.commit()
-        conn.close()
+        # Composite indexes so recent-history reads are range scans instead of filter+sort
+        indexes_existed = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_conv_session_ts'"
+        ).fetchone() is not None
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_conv_success_ts ON conversations(success, timestamp DESC)')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_conv_session_ts
+            ON conversations(session_id, timestamp DESC) WHERE success = 1
+        ''')
+        
+        # Gather planner statistics once, when the indexes are first created
+        if not indexes_existed:
+            cursor.execute('ANALYZE')
+        
         logger.info("Database tables initialized successfully")
     
     def store_conversation(self, user_input: str, jarvis_response: str, 
                           context: Optional[Dict] = None, session_id: str = None,
                           command_type: str = None, confidence: float = 1.0,
                           processing_time: float = None, success: bool = True):
-        """Store a conversation exchange"""
+        """Store a conversation exchange (queued for the background writer)"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT INTO conversations 
-                (user_input, jarvis_response, context, session_id, command_type, 
-                 confidence, processing_time, success)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (user_input, jarvis_response, json.dumps(context) if context else None, 
-                  session_id, command_type, confidence, processing_time, success))
-            
-            conn.commit()
-            conn.close()
-            logger.debug(f"Stored conversation: {user_input[:50]}...")
+            self._write_q.put(('conversation', (
+                user_input, jarvis_response, _dumps(context), 
+                session_id, command_type, confidence, processing_time, success
+            )))
+            logger.debug(f"Queued conversation: {user_input[:50]}...")
             return True
         except Exception as e:
             logger.error(f"Failed to store conversation: {e}")
             return False
     
-    def get_recent_conversations(self, limit: int = 10, session_id: str = None) -> List[Dict]:
-        """Get recent conversations for context"""
+    def get_recent_conversations(self, limit: int = 10, session_id: str = None,
+                                 parse_context: bool = True) -> List[Dict]:
+        """Get recent conversations for context.
+        
+        With parse_context=False the stored context JSON is returned undecoded.
+        """
+        self._wait_for_writes()
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._get_conn()
             cursor = conn.cursor()
             
             if session_id:
@@ -127,13 +308,13 @@ class MemoryManager:
                 ''', (limit,))
             
             results = cursor.fetchall()
-            conn.close()
+            load_context = _loads if parse_context else (lambda data: data)
             
             return [
                 {
                     'user_input': row[0],
                     'jarvis_response': row[1],
-                    'context': json.loads(row[2]) if row[2] else None,
+                    'context': load_context(row[2]),
                     'timestamp': row[3],
                     'command_type': row[4]
                 }
@@ -145,47 +326,51 @@ class MemoryManager:
     
     def get_conversation_context(self, session_id: str = None, limit: int = 5) -> str:
         """Get conversation context as formatted string for AI prompts"""
-        conversations = self.get_recent_conversations(limit, session_id)
-        
-        if not conversations:
+        self._wait_for_writes()
+        try:
+            conn = self._get_conn()
+            if session_id:
+                cursor = conn.execute(_CONTEXT_SESSION_SQL, (session_id, limit))
+            else:
+                cursor = conn.execute(_CONTEXT_SQL, (limit,))
+            
+            return "\n".join(row[0] for row in cursor)
+        except Exception as e:
+            logger.error(f"Failed to get conversation context: {e}")
             return ""
-        
-        context_parts = []
-        for conv in conversations:
-            context_parts.append(f"User: {conv['user_input']}")
-            context_parts.append(f"JARVIS: {conv['jarvis_response']}")
-        
-        return "\n".join(context_parts)
     
     def get_user_preferences(self) -> Dict[str, str]:
         """Get user preferences"""
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('SELECT preference_key, preference_value FROM user_preferences')
-            results = cursor.fetchall()
-            conn.close()
+        return dict(self._get_pref_cache())
+    
+    def _get_pref_cache(self) -> Dict[str, str]:
+        """Get the cached preference dict, loading it from the database on first use"""
+        with self._pref_lock:
+            if self._pref_cache is not None:
+                return self._pref_cache
             
-            return {row[0]: row[1] for row in results}
-        except Exception as e:
-            logger.error(f"Failed to get user preferences: {e}")
-            return {}
+            self._wait_for_writes()
+            try:
+                conn = self._get_conn()
+                cursor = conn.cursor()
+                
+                cursor.execute('SELECT preference_key, preference_value FROM user_preferences')
+                results = cursor.fetchall()
+                
+                self._pref_cache = {row[0]: row[1] for row in results}
+                return self._pref_cache
+            except Exception as e:
+                logger.error(f"Failed to get user preferences: {e}")
+                return {}
     
     def update_preference(self, key: str, value: str, description: str = None):
-        """Update user preference"""
+        """Update user preference (queued for the background writer)"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT OR REPLACE INTO user_preferences 
-                (preference_key, preference_value, description, updated_at)
-                VALUES (?, ?, ?, CURRENT_TIMESTAMP)
-            ''', (key, value, description))
-            
-            conn.commit()
-            conn.close()
+            with self._pref_lock:
+                self._write_q.put(('preference', (key, value, description)))
+                # Keep the cache hot rather than invalidating it
+                if self._pref_cache is not None:
+                    self._pref_cache[key] = value
             logger.info(f"Updated preference: {key} = {value}")
             return True
         except Exception as e:
@@ -194,67 +379,55 @@ class MemoryManager:
     
     def get_preference(self, key: str, default: str = None) -> str:
         """Get a specific user preference"""
-        preferences = self.get_user_preferences()
-        return preferences.get(key, default)
+        return self._get_pref_cache().get(key, default)
     
     def log_system_event(self, event_type: str, event_data: Dict = None, severity: str = "info"):
-        """Log system events for debugging and monitoring"""
+        """Log system events for debugging and monitoring.
+        
+        Every event goes to an in-memory ring buffer (see get_recent_events);
+        only warning/error/critical events are written to the database.
+        """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT INTO system_events (event_type, event_data, severity)
-                VALUES (?, ?, ?)
-            ''', (event_type, json.dumps(event_data) if event_data else None, severity))
-            
-            conn.commit()
-            conn.close()
+            self._event_ring.append({
+                'timestamp': datetime.now().isoformat(),
+                'event_type': event_type,
+                'event_data': event_data,
+                'severity': severity
+            })
+            if severity in _PERSISTED_SEVERITIES:
+                self._write_q.put(('event', (
+                    event_type, _dumps(event_data), severity
+                )))
         except Exception as e:
             logger.error(f"Failed to log system event: {e}")
     
+    def get_recent_events(self, limit: int = 100, severity: str = None) -> List[Dict]:
+        """Get recent system events from memory, newest first"""
+        events = list(self._event_ring)
+        if severity:
+            events = [event for event in events if event['severity'] == severity]
+        events.reverse()
+        return events[:limit]
+    
     def get_conversation_stats(self, days: int = 30) -> Dict[str, Any]:
         """Get conversation statistics"""
+        self._wait_for_writes()
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._get_conn()
             cursor = conn.cursor()
             
-            # Total conversations
-            cursor.execute('''
-                SELECT COUNT(*) FROM conversations 
-                WHERE timestamp >= datetime('now', '-{} days')
-            '''.format(days))
-            total_conversations = cursor.fetchone()[0]
+            since = (f'-{int(days)} days',)
             
-            # Successful conversations
-            cursor.execute('''
-                SELECT COUNT(*) FROM conversations 
-                WHERE success = 1 AND timestamp >= datetime('now', '-{} days')
-            '''.format(days))
-            successful_conversations = cursor.fetchone()[0]
+            # Totals, successes and average processing time in one pass
+            cursor.execute(_STATS_SQL, since)
+            total_conversations, successful_conversations, avg_processing_time = cursor.fetchone()
+            successful_conversations = successful_conversations or 0
+            avg_processing_time = avg_processing_time or 0
             
             # Most common command types
-            cursor.execute('''
-                SELECT command_type, COUNT(*) as count 
-                FROM conversations 
-                WHERE command_type IS NOT NULL 
-                AND timestamp >= datetime('now', '-{} days')
-                GROUP BY command_type 
-                ORDER BY count DESC 
-                LIMIT 5
-            '''.format(days))
+            cursor.execute(_TOP_COMMAND_TYPES_SQL, since)
             command_types = cursor.fetchall()
             
-            # Average processing time
-            cursor.execute('''
-                SELECT AVG(processing_time) FROM conversations 
-                WHERE processing_time IS NOT NULL 
-                AND timestamp >= datetime('now', '-{} days')
-            '''.format(days))
-            avg_processing_time = cursor.fetchone()[0] or 0
-            
-            conn.close()
-            
             return {
                 'total_conversations': total_conversations,
                 'successful_conversations': successful_conversations,
@@ -269,18 +442,31 @@ class MemoryManager:
     
     def clear_old_conversations(self, days: int = 90):
         """Clear conversations older than specified days"""
+        self._wait_for_writes()
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._get_conn()
             cursor = conn.cursor()
             
-            cursor.execute('''
-                DELETE FROM conversations 
-                WHERE timestamp < datetime('now', '-{} days')
-            '''.format(days))
+            # Fix the cutoff once so every batch deletes against the same boundary
+            cursor.execute("SELECT datetime('now', ?)", (f'-{int(days)} days',))
+            cutoff = cursor.fetchone()[0]
+            
+            # Delete in small autocommitted batches so the writer thread can
+            # interleave its inserts instead of waiting on one long DELETE
+            deleted_count = 0
+            while True:
+                cursor.execute('''
+                    DELETE FROM conversations 
+                    WHERE id IN (
+                        SELECT id FROM conversations WHERE timestamp < ? LIMIT ?
+                    )
+                ''', (cutoff, _DELETE_BATCH_ROWS))
+                deleted_count += cursor.rowcount
+                if cursor.rowcount < _DELETE_BATCH_ROWS:
+                    break
             
-            deleted_count = cursor.rowcount
-            conn.commit()
-            conn.close()
+            if deleted_count:
+                cursor.execute('PRAGMA wal_checkpoint(PASSIVE)')
             
             logger.info(f"Cleared {deleted_count} old conversations")
             return deleted_count
@@ -288,27 +474,164 @@ class MemoryManager:
             logger.error(f"Failed to clear old conversations: {e}")
             return 0
     
-    def export_conversations(self, file_path: str, format: str = "json"):
+    def export_conversations(self, file_path: str, format: str = "json", limit: int = 1000):
         """Export conversations to file"""
+        self._wait_for_writes()
         try:
-            conversations = self.get_recent_conversations(limit=1000)
+            conn = self._get_conn()
+            cursor = conn.cursor()
+            cursor.arraysize = _EXPORT_BATCH_ROWS
+            exported = 0
             
             if format.lower() == "json":
+                # Rows are streamed from the cursor straight into a JSON array
+                cursor.execute('''
+                    SELECT user_input, jarvis_response, context, timestamp, command_type
+                    FROM conversations 
+                    WHERE success = 1
+                    ORDER BY timestamp DESC 
+                    LIMIT ?
+                ''', (limit,))
                 with open(file_path, 'w') as f:
-                    json.dump(conversations, f, indent=2, default=str)
+                    f.write('[')
+                    for row in cursor:
+                        conv = {
+                            'user_input': row[0],
+                            'jarvis_response': row[1],
+                            'context': _loads(row[2]),
+                            'timestamp': row[3],
+                            'command_type': row[4]
+                        }
+                        f.write(',\n' if exported else '\n')
+                        f.write(_dumps_export(conv))
+                        exported += 1
+                    f.write('\n]\n' if exported else ']\n')
             elif format.lower() == "csv":
                 import csv
+                cursor.execute('''
+                    SELECT timestamp, user_input, jarvis_response, command_type
+                    FROM conversations 
+                    WHERE success = 1
+                    ORDER BY timestamp DESC 
+                    LIMIT ?
+                ''', (limit,))
                 with open(file_path, 'w', newline='') as f:
-                    writer = csv.DictWriter(f, fieldnames=['timestamp', 'user_input', 'jarvis_response', 'command_type'])
-                    writer.writeheader()
-                    for conv in conversations:
-                        writer.writerow(conv)
+                    writer = csv.writer(f)
+                    writer.writerow(['timestamp', 'user_input', 'jarvis_response', 'command_type'])
+                    while True:
+                        rows = cursor.fetchmany()
+                        if not rows:
+                            break
+                        writer.writerows(rows)
+                        exported += len(rows)
             
-            logger.info(f"Exported {len(conversations)} conversations to {file_path}")
+            logger.info(f"Exported {exported} conversations to {file_path}")
             return True
         except Exception as e:
             logger.error(f"Failed to export conversations: {e}")
             return False
+    
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Commit all queued writes; returns False if the writer did not finish in time"""
+        if not self._writer_thread.is_alive():
+            return self._write_q.unfinished_tasks == 0
+        
+        self._write_q.put(_FLUSH)
+        deadline = time.monotonic() + timeout
+        with self._write_q.all_tasks_done:
+            while self._write_q.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.warning("Timed out flushing memory writes")
+                    return False
+                self._write_q.all_tasks_done.wait(remaining)
+        return True
+    
+    def close(self):
+        """Flush queued writes, stop the writer thread and close every connection.
+        
+        Once the last connection closes SQLite checkpoints the WAL and removes the
+        -wal/-shm files.
+        """
+        self.flush()
+        self._write_q.put(_STOP)
+        self._writer_thread.join(timeout=5.0)
+        
+        with self._reader_conns_lock:
+            conns, self._reader_conns = self._reader_conns, []
+            self._local = threading.local()  # Later reads on any thread reopen a connection
+        for conn in conns:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                logger.warning(f"Error closing memory database connection: {e}")
+    
+    def _wait_for_writes(self):
+        """Give reads a consistent view by committing any queued writes first"""
+        if self._write_q.unfinished_tasks:
+            self.flush()
+    
+    def _writer_loop(self):
+        """Drain queued writes and commit them in batches (runs in writer thread)"""
+        # Dedicated connection with implicit transactions so each batch commits once
+        conn = self._connect()
+        cursor = conn.cursor()  # Reused for every batch
+        stopping = False
+        
+        while not stopping:
+            batch = []
+            markers = 0
+            deadline = None
+            
+            # Accumulate a batch until it is full, the wait elapses, or a flush/stop arrives
+            while len(batch) < _WRITE_BATCH_ROWS:
+                try:
+                    if deadline is None:
+                        item = self._write_q.get()
+                        deadline = time.monotonic() + _WRITE_BATCH_WAIT
+                    else:
+                        item = self._write_q.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                
+                if item is _FLUSH or item is _STOP:
+                    markers += 1
+                    stopping = item is _STOP
+                    break
+                batch.append(item)
+            
+            if batch:
+                self._write_batch(conn, cursor, batch)
+            for _ in range(len(batch) + markers):
+                self._write_q.task_done()
+        
+        conn.close()
+    
+    def _write_batch(self, conn: sqlite3.Connection, cursor: sqlite3.Cursor, batch: List[tuple]):
+        """Write a batch in a single transaction, grouped by statement"""
+        rows_by_kind: Dict[str, List[tuple]] = {}
+        for kind, row in batch:
+            rows_by_kind.setdefault(kind, []).append(row)
+        
+        try:
+            with conn:
+                for kind, rows in rows_by_kind.items():
+                    cursor.executemany(_WRITE_SQL[kind], rows)
+            logger.debug(f"Committed {len(batch)} memory writes")
+        except Exception as e:
+            # The batch rolled back as a whole; replay it row by row so only the bad writes are lost
+            logger.warning(f"Memory batch of {len(batch)} failed ({e}); retrying row by row")
+            for kind, row in batch:
+                try:
+                    with conn:
+                        cursor.execute(_WRITE_SQL[kind], row)
+                except Exception as row_error:
+                    logger.error(f"Failed to write {kind} to memory: {row_error}")
+
+def flush_memory_manager():
+    """Flush queued writes of the global memory manager, if it was created"""
+    if _memory_manager is not None:
+        _memory_manager.flush()
 
 # Global memory manager instance
 _memory_manager = None
@@ -13,6 +13,7 @@ from enum import Enum
 from .task_queue import task_queue, TaskType, TaskPriority, TaskStatus
 from .audio_manager import get_audio_manager
 from .camera_manager import get_camera_manager
+from .memory_manager import flush_memory_manager
 from ..audio.asr import ASRManager
 from ..audio.tts import TTSManager
 from ..config.config import config
@@ -29,7 +30,11 @@ class SystemState(Enum):
 
 @dataclass
 class SystemStatus:
-    """System status information"""
+    """System status information (slotted; built on every status poll)"""
+    # Declared by hand rather than dataclass(slots=True), which needs Python 3.10
+    __slots__ = ('state', 'audio_available', 'camera_available', 'asr_available',
+                 'tts_available', 'uptime', 'tasks_completed', 'tasks_failed')
+    
     state: SystemState
     audio_available: bool
     camera_available: bool
@@ -51,6 +56,7 @@ class ParallelJARVIS:
         self.camera_manager = get_camera_manager()
         self.asr_manager = None
         self.tts_manager = None
+        self._cmd_processor = None  # Created on first command and reused
         
         # Set speech callback
         if speech_callback:
@@ -62,6 +68,8 @@ class ParallelJARVIS:
         # System threads
         self.monitor_thread = None
         self.running = False
+        self._stop_event = threading.Event()  # Wakes the monitor immediately on stop()
+        self._next_stats_log = 0.0
         
         # Statistics
         self.stats = {
@@ -127,6 +135,7 @@ class ParallelJARVIS:
         
         try:
             self.running = True
+            self._stop_event.clear()
             
             # Start audio listening
             if self.audio_manager.state.value in ['ready', 'stopped']:
@@ -159,6 +168,7 @@ class ParallelJARVIS:
         with self.lock:
             self.state = SystemState.SHUTTING_DOWN
             self.running = False
+        self._stop_event.set()
         
         # Stop components
         if self.audio_manager:
@@ -170,6 +180,9 @@ class ParallelJARVIS:
         # Stop task queue
         task_queue.stop()
         
+        # Commit any queued memory writes
+        flush_memory_manager()
+        
         # Wait for monitor thread
         if self.monitor_thread and self.monitor_thread.is_alive():
             self.monitor_thread.join(timeout=5.0)
@@ -190,18 +203,12 @@ class ParallelJARVIS:
         )
         
         # Wait for result
-        max_wait = 30.0
-        start_time = time.time()
+        status, result = task_queue.wait_task(task_id, 30.0)
         
-        while time.time() - start_time < max_wait:
-            status = task_queue.get_task_status(task_id)
-            if status == TaskStatus.COMPLETED:
-                result = task_queue.get_task_result(task_id)
-                return result if result else "No response generated"
-            elif status == TaskStatus.FAILED:
-                return "Error processing command"
-            
-            time.sleep(0.1)
+        if status == TaskStatus.COMPLETED:
+            return result if result else "No response generated"
+        elif status in (TaskStatus.FAILED, TaskStatus.CANCELLED):
+            return "Error processing command"
         
         return "Command timed out"
     
@@ -215,18 +222,12 @@ class ParallelJARVIS:
         )
         
         # Wait for result
-        max_wait = 10.0
-        start_time = time.time()
+        status, result = task_queue.wait_task(task_id, 10.0)
         
-        while time.time() - start_time < max_wait:
-            status = task_queue.get_task_status(task_id)
-            if status == TaskStatus.COMPLETED:
-                result = task_queue.get_task_result(task_id)
-                return result if result else {"success": False, "message": "Unknown error"}
-            elif status == TaskStatus.FAILED:
-                return {"success": False, "message": "Photo capture failed"}
-            
-            time.sleep(0.1)
+        if status == TaskStatus.COMPLETED:
+            return result if result else {"success": False, "message": "Unknown error"}
+        elif status in (TaskStatus.FAILED, TaskStatus.CANCELLED):
+            return {"success": False, "message": "Photo capture failed"}
         
         return {"success": False, "message": "Photo capture timed out"}
     
@@ -235,13 +236,7 @@ class ParallelJARVIS:
         if self.camera_manager.state.value != 'capturing':
             return None
         
-        frame = self.camera_manager.get_current_frame()
-        if frame is not None:
-            import cv2
-            _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 80])
-            return buffer.tobytes()
-        
-        return None
+        return self.camera_manager.get_current_jpeg(quality=80)
     
     def get_system_status(self) -> SystemStatus:
         """Get comprehensive system status"""
@@ -320,23 +315,30 @@ class ParallelJARVIS:
             text = text.lower().strip()
             logger.info(f"Processing command: '{text}'")
             
-            # Import command processor
-            from ..commands.processor import CommandProcessor
-            processor = CommandProcessor(self)
-            
-            return processor.process_command(text)
+            return self._get_command_processor().process_command(text)
             
         except Exception as e:
             logger.error(f"Error processing command: {e}")
             return f"Error processing command: {str(e)}"
     
+    def _get_command_processor(self):
+        """Get the shared command processor, importing and building it on first use"""
+        if self._cmd_processor is None:
+            with self.lock:
+                if self._cmd_processor is None:
+                    # Imported lazily: the processor pulls in web/AI dependencies
+                    from ..commands.processor import CommandProcessor
+                    self._cmd_processor = CommandProcessor(self)
+        return self._cmd_processor
+    
     def _take_photo_internal(self) -> Dict[str, Any]:
         """Take photo internally"""
         try:
             if self.camera_manager.state.value != 'capturing':
                 return {"success": False, "message": "Camera not available"}
             
-            photo_path = self.camera_manager.capture_photo()
+            # Already on a queue worker: write synchronously so success means the file exists
+            photo_path = self.camera_manager.capture_photo(wait=True)
             
             if photo_path:
                 with self.lock:
@@ -358,28 +360,31 @@ class ParallelJARVIS:
         """Speak response using TTS"""
         try:
             if self.tts_manager:
-                self.tts_manager.speak(text, play_audio=True)
+                self.tts_manager.speak_streaming(text)
         except Exception as e:
             logger.error(f"Error speaking response: {e}")
     
     def _system_monitor_loop(self):
         """System monitoring loop"""
         logger.info("System monitor started")
+        self._next_stats_log = time.monotonic() + 60.0
         
         while self.running:
             try:
                 # Check component health
                 self._check_component_health()
                 
-                # Log system statistics periodically
-                if int(time.time()) % 60 == 0:  # Every minute
+                # Log system statistics every minute
+                now = time.monotonic()
+                if now >= self._next_stats_log:
                     self._log_system_stats()
+                    self._next_stats_log = now + 60.0
                 
-                time.sleep(5.0)  # Check every 5 seconds
+                self._stop_event.wait(10.0)  # Check every 10 seconds
                 
             except Exception as e:
                 logger.error(f"Error in system monitor: {e}")
-                time.sleep(1.0)
+                self._stop_event.wait(1.0)
         
         logger.info("System monitor stopped")
     
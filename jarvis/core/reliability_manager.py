@@ -3,16 +3,28 @@ JARVIS Reliability Manager - Comprehensive error handling, logging, and recovery
 """
 
 import time
+import asyncio
 import threading
 import logging
+import logging.handlers
+import atexit
 import traceback
 import os
 import json
+import queue
+import array
+import math
+from collections import Counter
 from typing import Dict, Any, List, Optional, Callable
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, fields
 from enum import Enum
 from pathlib import Path
 import psutil
+# Optional dependency: orjson is much faster than the stdlib json module
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +39,11 @@ class HealthStatus(Enum):
 @dataclass
 class ComponentHealth:
     """Health information for a system component"""
+    # Declared by hand rather than dataclass(slots=True), which needs Python 3.10.
+    # _dict_view is the dict form returned by get_system_health, kept in step by update()
+    __slots__ = ('name', 'status', 'last_check', 'error_count', 'last_error',
+                 'uptime', 'recovery_attempts', 'metrics', '_dict_view')
+    
     name: str
     status: HealthStatus
     last_check: float
@@ -35,10 +52,29 @@ class ComponentHealth:
     uptime: float
     recovery_attempts: int
     metrics: Dict[str, Any]
+    
+    def __post_init__(self):
+        self._dict_view = {f.name: getattr(self, f.name) for f in fields(self)}
+    
+    def update(self, **changes):
+        """Set fields on both the dataclass and its cached dict view"""
+        for name, value in changes.items():
+            setattr(self, name, value)
+        self._dict_view.update(changes)
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """Caller-owned copy of the dict view (the metrics dict is copied too)"""
+        view = dict(self._dict_view)
+        if view['metrics'] is not None:
+            view['metrics'] = dict(view['metrics'])
+        return view
 
 @dataclass
 class SystemMetrics:
     """System-wide metrics"""
+    __slots__ = ('cpu_usage', 'memory_usage', 'disk_usage', 'network_active',
+                 'temperature', 'load_average')
+    
     cpu_usage: float
     memory_usage: float
     disk_usage: float
@@ -46,12 +82,35 @@ class SystemMetrics:
     temperature: Optional[float]
     load_average: List[float]
 
+# Overall status codes stored in the health history arrays
+_HEALTH_STATUSES = tuple(HealthStatus)
+_HEALTH_STATUS_CODES = {status: code for code, status in enumerate(_HEALTH_STATUSES)}
+
+# Well-known CPU sensor names from psutil.sensors_temperatures(), checked first
+_CPU_SENSOR_KEYS = ('coretemp', 'k10temp', 'cpu_thermal', 'cpu-thermal')
+
+# Marker that stops the health report writer thread
+_STOP_WRITER = object()
+
+# Refresh intervals for metrics that change slowly (seconds)
+_DISK_USAGE_TTL = 60.0
+_TEMPERATURE_TTL = 300.0
+
 class ReliabilityManager:
     """Manages system reliability, error handling, and recovery"""
     
+    # Set once the root logger has the file handlers, so extra instances don't add more
+    _logging_configured = False
+    
     def __init__(self):
         self.components: Dict[str, ComponentHealth] = {}
+        
+        # Guards components and their counters; readers iterate the immutable
+        # snapshot, which is swapped whenever the component set changes
+        self._lock = threading.RLock()
+        self._components_snapshot: tuple = ()
         self.system_metrics = SystemMetrics(0, 0, 0, False, None, [])
+        self._metrics_view = asdict(self.system_metrics)  # Refreshed once per metrics update
         
         # Configuration
         self.check_interval = 10.0  # seconds
@@ -63,20 +122,59 @@ class ReliabilityManager:
         self.log_dir.mkdir(exist_ok=True)
         self._setup_logging()
         
-        # Threading
+        # Monitoring runs as an asyncio task when started from a running event
+        # loop, otherwise on a dedicated thread
         self.monitor_thread = None
+        self._monitor_task: Optional[asyncio.Task] = None
         self.running = False
         
+        # Health reports are serialized by the caller and written to disk by a
+        # writer thread; when the small queue is full the oldest report is dropped
+        self._report_queue: queue.Queue = queue.Queue(maxsize=4)
+        self._report_writer: Optional[threading.Thread] = None
+        
         # Error tracking
         self.global_error_count = 0
         self.last_critical_error = None
+        self._earliest_registration: Optional[float] = None  # Start of system uptime
+        self._status_counts: Counter = Counter()  # Components per HealthStatus
         
         # Recovery callbacks
         self.recovery_callbacks: Dict[str, Callable] = {}
         
-        # Health history
-        self.health_history: List[Dict[str, Any]] = []
+        # Health history as a ring of parallel arrays (one slot per snapshot), so
+        # recording a snapshot is a handful of scalar writes with no allocation
         self.max_history_size = 1000
+        size = self.max_history_size
+        self._hist_ts = array.array('d', [0.0]) * size
+        self._hist_cpu = array.array('d', [0.0]) * size
+        self._hist_mem = array.array('d', [0.0]) * size
+        self._hist_disk = array.array('d', [0.0]) * size
+        self._hist_temp = array.array('d', [0.0]) * size  # NaN when unavailable
+        self._hist_load = array.array('d', [0.0]) * (size * 3)  # 1/5/15-minute triples; NaN when unavailable
+        self._hist_net = array.array('b', [0]) * size
+        self._hist_status = array.array('b', [0]) * size  # Index into _HEALTH_STATUSES
+        self._hist_components = array.array('l', [0]) * size
+        self._hist_errors = array.array('l', [0]) * size
+        self._hist_idx = 0  # Next slot to write
+        self._hist_len = 0
+        
+        # Prime the CPU counters so later non-blocking samples report the
+        # utilization since the previous monitoring tick
+        self._prev_cpu_times: Optional[tuple] = None
+        if self._read_proc_cpu() is None:
+            psutil.cpu_percent(interval=None)
+        
+        # Slow-changing metrics are refreshed less often than every tick
+        self._disk_checked_at = float('-inf')
+        self._temperature_checked_at = float('-inf')
+        self._cpu_sensor_key: Optional[str] = None  # Discovered on the first temperature read
+        
+        # Probe sensors once; most containers, VMs and macOS have none
+        try:
+            self._temps_available = bool(psutil.sensors_temperatures())
+        except (AttributeError, OSError):
+            self._temps_available = False
         
         logger.info("ReliabilityManager initialized")
     
@@ -88,13 +186,28 @@ class ReliabilityManager:
         
         self.running = True
         
-        # Start monitoring thread
-        self.monitor_thread = threading.Thread(
-            target=self._monitoring_loop,
-            name="JARVIS-Reliability",
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        
+        self._report_writer = threading.Thread(
+            target=self._report_writer_loop,
+            name="JARVIS-HealthReports",
             daemon=True
         )
-        self.monitor_thread.start()
+        self._report_writer.start()
+        
+        if loop is not None:
+            self._monitor_task = loop.create_task(self._monitoring_loop_async())
+        else:
+            # Start monitoring thread
+            self.monitor_thread = threading.Thread(
+                target=self._monitoring_loop,
+                name="JARVIS-Reliability",
+                daemon=True
+            )
+            self.monitor_thread.start()
         
         logger.info("ReliabilityManager started")
     
@@ -106,29 +219,51 @@ class ReliabilityManager:
         logger.info("Stopping ReliabilityManager...")
         self.running = False
         
+        if self._monitor_task is not None:
+            self._monitor_task.cancel()
+            self._monitor_task = None
+        
         if self.monitor_thread and self.monitor_thread.is_alive():
             self.monitor_thread.join(timeout=5.0)
         
-        # Save final health report
+        # Save final health report, then let the writer drain and exit
         self._save_health_report()
+        if self._report_writer and self._report_writer.is_alive():
+            try:
+                self._report_queue.put(_STOP_WRITER, timeout=5.0)
+            except queue.Full:
+                logger.warning("Health report queue still full at shutdown")
+            self._report_writer.join(timeout=5.0)
+        self._report_writer = None
         
         logger.info("ReliabilityManager stopped")
     
     def register_component(self, name: str, recovery_callback: Optional[Callable] = None):
         """Register a component for monitoring"""
-        self.components[name] = ComponentHealth(
-            name=name,
-            status=HealthStatus.HEALTHY,
-            last_check=time.time(),
-            error_count=0,
-            last_error=None,
-            uptime=time.time(),
-            recovery_attempts=0,
-            metrics={}
-        )
-        
-        if recovery_callback:
-            self.recovery_callbacks[name] = recovery_callback
+        now = time.time()
+        with self._lock:
+            if self._earliest_registration is None:
+                self._earliest_registration = now
+            
+            previous = self.components.get(name)
+            if previous is not None:
+                self._status_counts[previous.status] -= 1
+            self._status_counts[HealthStatus.HEALTHY] += 1
+            
+            self.components[name] = ComponentHealth(
+                name=name,
+                status=HealthStatus.HEALTHY,
+                last_check=now,
+                error_count=0,
+                last_error=None,
+                uptime=now,
+                recovery_attempts=0,
+                metrics={}
+            )
+            self._components_snapshot = tuple(self.components.values())
+            
+            if recovery_callback:
+                self.recovery_callbacks[name] = recovery_callback
         
         logger.info(f"Component registered: {name}")
     
@@ -136,25 +271,27 @@ class ReliabilityManager:
                               metrics: Optional[Dict[str, Any]] = None,
                               error: Optional[str] = None):
         """Report health status for a component"""
-        if name not in self.components:
-            self.register_component(name)
-        
-        component = self.components[name]
-        component.status = status
-        component.last_check = time.time()
-        
-        if metrics:
-            component.metrics.update(metrics)
+        needs_recovery = False
+        with self._lock:
+            if name not in self.components:
+                self.register_component(name)
+            
+            component = self.components[name]
+            self._update_component(component, status=status, last_check=time.time())
+            
+            if metrics:
+                component.metrics.update(metrics)
+            
+            if error:
+                self._update_component(component, error_count=component.error_count + 1, last_error=error)
+                self.global_error_count += 1
+                
+                # Check if component needs recovery
+                needs_recovery = component.error_count >= self.max_error_count
         
         if error:
-            component.error_count += 1
-            component.last_error = error
-            self.global_error_count += 1
-            
             logger.warning(f"Component error reported: {name} - {error}")
-            
-            # Check if component needs recovery
-            if component.error_count >= self.max_error_count:
+            if needs_recovery:
                 self._trigger_component_recovery(name)
         
         # Log critical status changes
@@ -168,9 +305,10 @@ class ReliabilityManager:
         """Report an error for a component"""
         error_msg = f"{context}: {str(error)}" if context else str(error)
         
-        # Log full traceback for debugging
-        logger.error(f"Error in {component}: {error_msg}")
-        logger.debug(f"Full traceback: {traceback.format_exc()}")
+        # Log full traceback for debugging (only formatted when debug logging is on)
+        logger.error("Error in %s: %s", component, error_msg)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Full traceback: %s", traceback.format_exc())
         
         # Update component health
         self.report_component_health(
@@ -185,12 +323,13 @@ class ReliabilityManager:
         
         return {
             'overall_status': overall_status.value,
-            'components': {name: asdict(comp) for name, comp in self.components.items()},
-            'system_metrics': asdict(self.system_metrics),
+            # Shallow copies: callers get their own dicts, never the live views
+            'components': {comp.name: comp.as_dict() for comp in self._components_snapshot},
+            'system_metrics': dict(self._metrics_view),
             'global_stats': {
                 'total_errors': self.global_error_count,
                 'last_critical_error': self.last_critical_error,
-                'uptime': time.time() - min(comp.uptime for comp in self.components.values()) if self.components else 0
+                'uptime': time.time() - self._earliest_registration if self._earliest_registration is not None else 0
             }
         }
     
@@ -206,8 +345,20 @@ class ReliabilityManager:
         
         return self._trigger_component_recovery(name)
     
+    def _update_component(self, component: ComponentHealth, **changes):
+        """Apply field changes to a component, keeping the status counts in step"""
+        status = changes.get('status')
+        if status is not None and status != component.status:
+            self._status_counts[component.status] -= 1
+            self._status_counts[status] += 1
+        component.update(**changes)
+    
     def _setup_logging(self):
-        """Setup comprehensive logging"""
+        """Setup comprehensive logging (once per process, shared by all instances)"""
+        if ReliabilityManager._logging_configured:
+            return
+        ReliabilityManager._logging_configured = True
+        
         # Create log files
         log_files = {
             'main': self.log_dir / 'jarvis.log',
@@ -216,6 +367,7 @@ class ReliabilityManager:
         }
         
         # Setup file handlers
+        handlers = []
         for log_type, log_file in log_files.items():
             handler = logging.FileHandler(log_file)
             handler.setLevel(logging.DEBUG if log_type == 'main' else logging.WARNING)
@@ -224,9 +376,21 @@ class ReliabilityManager:
                 '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
             )
             handler.setFormatter(formatter)
-            
-            # Add to root logger
-            logging.getLogger().addHandler(handler)
+            handlers.append(handler)
+        
+        # File IO happens on a listener thread; logging calls only enqueue the record
+        log_queue: queue.Queue = queue.Queue(-1)
+        self._log_listener = logging.handlers.QueueListener(
+            log_queue, *handlers, respect_handler_level=True
+        )
+        self._log_listener.start()
+        
+        # Flush and stop the listener at exit rather than in stop(), so records
+        # logged after the monitor stops still reach the files
+        atexit.register(self._log_listener.stop)
+        
+        # Add to root logger
+        logging.getLogger().addHandler(logging.handlers.QueueHandler(log_queue))
     
     def _monitoring_loop(self):
         """Main monitoring loop"""
@@ -234,18 +398,7 @@ class ReliabilityManager:
         
         while self.running:
             try:
-                # Update system metrics
-                self._update_system_metrics()
-                
-                # Check component health
-                self._check_component_health()
-                
-                # Save health snapshot
-                self._save_health_snapshot()
-                
-                # Cleanup old data
-                self._cleanup_old_data()
-                
+                self._monitor_tick()
                 time.sleep(self.check_interval)
                 
             except Exception as e:
@@ -254,19 +407,60 @@ class ReliabilityManager:
         
         logger.info("Reliability monitoring stopped")
     
+    async def _monitoring_loop_async(self):
+        """Monitoring loop for an asyncio event loop; blocking work runs in the default executor"""
+        logger.info("Reliability monitoring started (asyncio)")
+        loop = asyncio.get_running_loop()
+        
+        try:
+            while self.running:
+                try:
+                    await loop.run_in_executor(None, self._monitor_tick)
+                    await asyncio.sleep(self.check_interval)
+                    
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error(f"Error in monitoring loop: {e}")
+                    await asyncio.sleep(1.0)
+        finally:
+            logger.info("Reliability monitoring stopped")
+    
+    def _monitor_tick(self):
+        """One monitoring pass: metrics, component health, snapshot, cleanup"""
+        # Update system metrics
+        self._update_system_metrics()
+        
+        # Check component health
+        self._check_component_health()
+        
+        # Save health snapshot
+        self._save_health_snapshot()
+        
+        # Cleanup old data
+        self._cleanup_old_data()
+    
     def _update_system_metrics(self):
         """Update system-wide metrics"""
         try:
-            # CPU usage
-            self.system_metrics.cpu_usage = psutil.cpu_percent(interval=1)
+            now = time.monotonic()
+            
+            # CPU usage since the last tick (non-blocking; the loop sleep is the sample window)
+            cpu_usage = self._read_proc_cpu()
+            if cpu_usage is None:
+                cpu_usage = psutil.cpu_percent(interval=None)
+            self.system_metrics.cpu_usage = cpu_usage
             
             # Memory usage
-            memory = psutil.virtual_memory()
-            self.system_metrics.memory_usage = memory.percent
+            memory_usage = self._read_proc_meminfo()
+            if memory_usage is None:
+                memory_usage = psutil.virtual_memory().percent
+            self.system_metrics.memory_usage = memory_usage
             
             # Disk usage
-            disk = psutil.disk_usage('/')
-            self.system_metrics.disk_usage = disk.percent
+            if now - self._disk_checked_at >= _DISK_USAGE_TTL:
+                self.system_metrics.disk_usage = psutil.disk_usage('/').percent
+                self._disk_checked_at = now
             
             # Network activity
             network = psutil.net_io_counters()
@@ -276,30 +470,90 @@ class ReliabilityManager:
             if hasattr(os, 'getloadavg'):
                 self.system_metrics.load_average = list(os.getloadavg())
             
-            # Temperature (if available)
-            try:
-                temps = psutil.sensors_temperatures()
-                if temps:
-                    # Get CPU temperature
-                    for name, entries in temps.items():
-                        if 'cpu' in name.lower() or 'core' in name.lower():
-                            self.system_metrics.temperature = entries[0].current
-                            break
-            except:
-                pass  # Temperature monitoring not available
+            # Temperature (if available); sensors are slow to read and change slowly
+            if self._temps_available and now - self._temperature_checked_at >= _TEMPERATURE_TTL:
+                self._temperature_checked_at = now
+                try:
+                    temps = psutil.sensors_temperatures()
+                    if temps:
+                        # Get CPU temperature
+                        key = self._cpu_sensor_key
+                        if key is None or key not in temps:
+                            key = self._cpu_sensor_key = self._find_cpu_sensor(temps)
+                        if key is not None and temps[key]:
+                            self.system_metrics.temperature = temps[key][0].current
+                except (AttributeError, OSError):
+                    pass  # Temperature monitoring not available
+            
+            self._metrics_view = asdict(self.system_metrics)
                 
         except Exception as e:
             logger.error(f"Error updating system metrics: {e}")
     
+    @staticmethod
+    def _find_cpu_sensor(temps: Dict[str, Any]) -> Optional[str]:
+        """Pick the CPU sensor key: a known name first, else any name mentioning cpu/core"""
+        for key in _CPU_SENSOR_KEYS:
+            if key in temps:
+                return key
+        for key in temps:
+            lowered = key.lower()
+            if 'cpu' in lowered or 'core' in lowered:
+                return key
+        return None
+    
+    def _read_proc_cpu(self) -> Optional[float]:
+        """CPU utilization since the previous call from one /proc/stat read (None if unavailable)"""
+        try:
+            with open('/proc/stat', 'rb') as f:
+                fields = f.readline().split()
+        except OSError:
+            return None
+        
+        # cpu user nice system idle iowait irq softirq steal ...; guest time is
+        # already included in user/nice
+        times = [int(value) for value in fields[1:9]]
+        idle = times[3] + times[4]
+        total = sum(times)
+        
+        prev = self._prev_cpu_times
+        self._prev_cpu_times = (total, idle)
+        if prev is None or total <= prev[0]:
+            return 0.0
+        
+        return round(100.0 * (1.0 - (idle - prev[1]) / (total - prev[0])), 1)
+    
+    def _read_proc_meminfo(self) -> Optional[float]:
+        """Memory usage percent from one /proc/meminfo read (None if unavailable)"""
+        try:
+            with open('/proc/meminfo', 'rb') as f:
+                values = {}
+                for line in f:
+                    key, _, rest = line.partition(b':')
+                    if key in (b'MemTotal', b'MemAvailable'):
+                        values[key] = int(rest.split()[0])
+                        if len(values) == 2:
+                            break
+        except OSError:
+            return None
+        
+        total = values.get(b'MemTotal')
+        available = values.get(b'MemAvailable')
+        if not total or available is None:
+            return None
+        return round(100.0 * (total - available) / total, 1)
+    
     def _check_component_health(self):
         """Check health of all registered components"""
         current_time = time.time()
         
-        for name, component in self.components.items():
+        for component in self._components_snapshot:
+            name = component.name
             try:
                 # Check if component is stale (no recent updates)
                 if current_time - component.last_check > 60.0:  # 1 minute
-                    component.status = HealthStatus.WARNING
+                    with self._lock:
+                        self._update_component(component, status=HealthStatus.WARNING)
                     logger.warning(f"Component stale: {name}")
                 
                 # Check if component needs recovery
@@ -313,29 +567,30 @@ class ReliabilityManager:
     
     def _trigger_component_recovery(self, name: str) -> bool:
         """Trigger recovery for a component"""
-        if name not in self.components:
-            return False
-        
-        component = self.components[name]
-        component.recovery_attempts += 1
-        component.status = HealthStatus.RECOVERING
+        with self._lock:
+            component = self.components.get(name)
+            if component is None:
+                return False
+            
+            self._update_component(component, recovery_attempts=component.recovery_attempts + 1,
+                                   status=HealthStatus.RECOVERING)
+            recovery_func = self.recovery_callbacks.get(name)
         
         logger.info(f"Triggering recovery for component: {name} (attempt {component.recovery_attempts})")
         
+        # The callback runs without the lock so slow recoveries don't block reporters
         try:
-            # Call recovery callback if available
-            if name in self.recovery_callbacks:
-                recovery_func = self.recovery_callbacks[name]
+            if recovery_func is not None:
                 success = recovery_func()
                 
                 if success:
-                    component.status = HealthStatus.HEALTHY
-                    component.error_count = 0
-                    component.last_error = None
+                    with self._lock:
+                        self._update_component(component, status=HealthStatus.HEALTHY, error_count=0, last_error=None)
                     logger.info(f"Component recovery successful: {name}")
                     return True
                 else:
-                    component.status = HealthStatus.FAILED
+                    with self._lock:
+                        self._update_component(component, status=HealthStatus.FAILED)
                     logger.error(f"Component recovery failed: {name}")
                     return False
             else:
@@ -344,7 +599,8 @@ class ReliabilityManager:
                 
         except Exception as e:
             logger.error(f"Error during component recovery {name}: {e}")
-            component.status = HealthStatus.FAILED
+            with self._lock:
+                self._update_component(component, status=HealthStatus.FAILED)
             return False
     
     def _calculate_overall_health(self) -> HealthStatus:
@@ -352,23 +608,18 @@ class ReliabilityManager:
         if not self.components:
             return HealthStatus.HEALTHY
         
-        statuses = [comp.status for comp in self.components.values()]
-        
-        # If any component is failed, system is critical
-        if HealthStatus.FAILED in statuses:
-            return HealthStatus.CRITICAL
+        counts = self._status_counts
         
-        # If any component is critical, system is critical
-        if HealthStatus.CRITICAL in statuses:
+        # If any component is failed or critical, system is critical
+        if counts[HealthStatus.FAILED] or counts[HealthStatus.CRITICAL]:
             return HealthStatus.CRITICAL
         
         # If any component is recovering, system is warning
-        if HealthStatus.RECOVERING in statuses:
+        if counts[HealthStatus.RECOVERING]:
             return HealthStatus.WARNING
         
         # If more than half are warning, system is warning
-        warning_count = statuses.count(HealthStatus.WARNING)
-        if warning_count > len(statuses) / 2:
+        if counts[HealthStatus.WARNING] > len(self.components) / 2:
             return HealthStatus.WARNING
         
         # Otherwise, system is healthy
@@ -376,19 +627,59 @@ class ReliabilityManager:
     
     def _save_health_snapshot(self):
         """Save current health snapshot to history"""
-        snapshot = {
-            'timestamp': time.time(),
-            'overall_status': self._calculate_overall_health().value,
-            'component_count': len(self.components),
-            'error_count': self.global_error_count,
-            'system_metrics': asdict(self.system_metrics)
-        }
-        
-        self.health_history.append(snapshot)
+        i = self._hist_idx
+        metrics = self.system_metrics
+        temperature = metrics.temperature
+        
+        self._hist_ts[i] = time.time()
+        self._hist_cpu[i] = metrics.cpu_usage
+        self._hist_mem[i] = metrics.memory_usage
+        self._hist_disk[i] = metrics.disk_usage
+        self._hist_temp[i] = math.nan if temperature is None else temperature
+        self._hist_net[i] = metrics.network_active
+        load = metrics.load_average
+        self._hist_load[i * 3:i * 3 + 3] = array.array(
+            'd', load if len(load) == 3 else (math.nan, math.nan, math.nan)
+        )
+        self._hist_status[i] = _HEALTH_STATUS_CODES[self._calculate_overall_health()]
+        self._hist_components[i] = len(self.components)
+        self._hist_errors[i] = self.global_error_count
         
-        # Limit history size
-        if len(self.health_history) > self.max_history_size:
-            self.health_history = self.health_history[-self.max_history_size:]
+        self._hist_idx = (i + 1) % self.max_history_size
+        if self._hist_len < self.max_history_size:
+            self._hist_len += 1
+    
+    def get_health_history(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get the most recent health snapshots as dicts, oldest first"""
+        count = self._hist_len if limit is None else min(limit, self._hist_len)
+        size = self.max_history_size
+        start = (self._hist_idx - count) % size
+        
+        history = []
+        for n in range(count):
+            i = (start + n) % size
+            temperature = self._hist_temp[i]
+            load = self._hist_load[i * 3:i * 3 + 3]
+            history.append({
+                'timestamp': self._hist_ts[i],
+                'overall_status': _HEALTH_STATUSES[self._hist_status[i]].value,
+                'component_count': self._hist_components[i],
+                'error_count': self._hist_errors[i],
+                'system_metrics': {
+                    'cpu_usage': self._hist_cpu[i],
+                    'memory_usage': self._hist_mem[i],
+                    'disk_usage': self._hist_disk[i],
+                    'network_active': bool(self._hist_net[i]),
+                    'temperature': None if math.isnan(temperature) else temperature,
+                    'load_average': [] if math.isnan(load[0]) else load.tolist()
+                }
+            })
+        return history
+    
+    @property
+    def health_history(self) -> List[Dict[str, Any]]:
+        """All retained health snapshots, oldest first (built on access)"""
+        return self.get_health_history()
     
     def _save_health_report(self):
         """Save comprehensive health report to file"""
@@ -398,32 +689,81 @@ class ReliabilityManager:
             report = {
                 'timestamp': time.time(),
                 'system_health': self.get_system_health(),
-                'health_history': self.health_history[-100:]  # Last 100 snapshots
+                'health_history': self.get_health_history(100)  # Last 100 snapshots
             }
             
-            with open(report_file, 'w') as f:
-                json.dump(report, f, indent=2, default=str)
+            if orjson is not None:
+                payload = orjson.dumps(
+                    report, default=str,
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_DATACLASS | orjson.OPT_NON_STR_KEYS
+                )
+            else:
+                payload = json.dumps(report, indent=2, default=str).encode()
+            
+            if self._report_writer is None or not self._report_writer.is_alive():
+                # No writer running (manager not started); write inline
+                report_file.write_bytes(payload)
+                logger.info(f"Health report saved: {report_file}")
+                return
             
-            logger.info(f"Health report saved: {report_file}")
+            self._enqueue_report(report_file, payload)
             
         except Exception as e:
             logger.error(f"Error saving health report: {e}")
     
+    def _enqueue_report(self, report_file: Path, payload: bytes):
+        """Queue a report for the writer, dropping the oldest queued one if full"""
+        while True:
+            try:
+                self._report_queue.put_nowait((report_file, payload))
+                return
+            except queue.Full:
+                try:
+                    dropped_file, _ = self._report_queue.get_nowait()
+                    self._report_queue.task_done()
+                    logger.warning(f"Health report queue full, dropped {dropped_file.name}")
+                except queue.Empty:
+                    pass
+    
+    def _report_writer_loop(self):
+        """Write queued health reports to disk (runs in writer thread)"""
+        while True:
+            item = self._report_queue.get()
+            try:
+                if item is _STOP_WRITER:
+                    return
+                report_file, payload = item
+                report_file.write_bytes(payload)
+                logger.info(f"Health report saved: {report_file}")
+            except Exception as e:
+                logger.error(f"Error saving health report: {e}")
+            finally:
+                self._report_queue.task_done()
+    
     def _cleanup_old_data(self):
         """Cleanup old log files and data"""
         try:
             # Clean up old log files (keep last 7 days)
             cutoff_time = time.time() - (7 * 24 * 3600)
             
-            for log_file in self.log_dir.glob("*.log"):
-                if log_file.stat().st_mtime < cutoff_time:
-                    log_file.unlink()
+            # One directory pass; DirEntry caches what getdents/stat returned
+            health_reports = []
+            with os.scandir(self.log_dir) as entries:
+                for entry in entries:
+                    if not entry.is_file():
+                        continue
+                    name = entry.name
+                    if name.endswith('.log'):
+                        if entry.stat().st_mtime < cutoff_time:
+                            os.unlink(entry.path)
+                    elif name.startswith('health_report_') and name.endswith('.json'):
+                        health_reports.append((name, entry.path))
             
-            # Clean up old health reports (keep last 30)
-            health_reports = sorted(self.log_dir.glob("health_report_*.json"))
+            # Clean up old health reports (keep last 30); names embed the timestamp
             if len(health_reports) > 30:
-                for report in health_reports[:-30]:
-                    report.unlink()
+                health_reports.sort()
+                for _, path in health_reports[:-30]:
+                    os.unlink(path)
                     
         except Exception as e:
             logger.error(f"Error during cleanup: {e}")
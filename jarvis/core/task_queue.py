@@ -2,19 +2,33 @@
 JARVIS Task Queue System - Centralized task management with priority and retry logic
 """
 
+import sys
 import time
 import threading
-import queue
 import logging
 import uuid
+import os
+import random
+import heapq
+import itertools
 from enum import Enum, IntEnum
 from dataclasses import dataclass, field
-from typing import Any, Callable, Dict, List, Optional, Union
+from collections import OrderedDict, deque
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 from concurrent.futures import ThreadPoolExecutor, Future
 import traceback
 
 logger = logging.getLogger(__name__)
 
+# Completed and failed tasks remembered for status/result lookups
+_FINISHED_HISTORY = 100
+
+# Most tasks the dispatcher takes off the queues per lock acquisition
+_DISPATCH_BATCH = 32
+
+# Retry jitter source; SystemRandom avoids contending on the shared random module state
+_retry_random = random.SystemRandom()
+
 class TaskPriority(IntEnum):
     """Task priority levels (lower number = higher priority)"""
     CRITICAL = 0    # System critical tasks
@@ -32,21 +46,31 @@ class TaskStatus(Enum):
     RETRYING = "retrying"
     CANCELLED = "cancelled"
 
-class TaskType(Enum):
-    """Types of tasks in the system"""
-    VOICE_COMMAND = "voice_command"
-    TEXT_COMMAND = "text_command"
-    PHOTO_CAPTURE = "photo_capture"
-    CAMERA_ANALYSIS = "camera_analysis"
-    TTS_SYNTHESIS = "tts_synthesis"
-    SYSTEM_STATUS = "system_status"
-    AUDIO_INIT = "audio_init"
-    CAMERA_INIT = "camera_init"
-    CLEANUP = "cleanup"
+class TaskType(IntEnum):
+    """Types of tasks in the system (int-valued; str() gives the readable name)"""
+    VOICE_COMMAND = 0
+    TEXT_COMMAND = 1
+    PHOTO_CAPTURE = 2
+    CAMERA_ANALYSIS = 3
+    TTS_SYNTHESIS = 4
+    SYSTEM_STATUS = 5
+    AUDIO_INIT = 6
+    CAMERA_INIT = 7
+    CLEANUP = 8
+    
+    def __str__(self) -> str:
+        return _TASK_TYPE_NAMES[self]
 
-@dataclass
+# Readable task type names, built once (e.g. "voice_command")
+_TASK_TYPE_NAMES = {t: t.name.lower() for t in TaskType}
+
+# dataclass(slots=True) needs Python 3.10; a literal __slots__ would clash with Task's
+# field defaults, so older interpreters get a regular (dict-backed) Task instead
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_SLOTS)
 class Task:
-    """Represents a task in the queue"""
+    """Represents a task in the queue (slotted on Python 3.10+; one per submission)"""
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
     task_type: TaskType = TaskType.TEXT_COMMAND
     priority: TaskPriority = TaskPriority.NORMAL
@@ -56,37 +80,40 @@ class Task:
     callback: Optional[Callable] = None
     error_callback: Optional[Callable] = None
     max_retries: int = 3
-    retry_delay: float = 1.0
+    retry_delay: float = 1.0        # Base delay; doubles per attempt up to max_retry_delay
+    max_retry_delay: float = 60.0
+    jitter_factor: float = 1.0      # Fraction of the backoff window to randomize over
     timeout: float = 30.0
     
     # Runtime fields
     status: TaskStatus = TaskStatus.PENDING
     attempts: int = 0
     created_at: float = field(default_factory=time.time)
-    started_at: Optional[float] = None
-    completed_at: Optional[float] = None
+    started_at: Optional[float] = None      # time.monotonic(), for durations only
+    completed_at: Optional[float] = None    # time.monotonic(), for durations only
     result: Any = None
     error: Optional[Exception] = None
     future: Optional[Future] = None
-
-    def __lt__(self, other):
-        """For priority queue ordering"""
-        if self.priority != other.priority:
-            return self.priority < other.priority
-        return self.created_at < other.created_at
+    done_event: threading.Event = field(default_factory=threading.Event)  # Set once the task reaches a final state
 
 class TaskQueue:
     """Centralized task queue with parallel processing and retry logic"""
     
-    def __init__(self, max_workers: int = 4):
-        self.max_workers = max_workers
-        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="JARVIS-Worker")
+    def __init__(self, max_workers: Optional[int] = None):
+        # One shared pool runs every task type; sized to the machine by default
+        self.max_workers = max_workers or default_worker_count()
+        self.executor = self._create_executor()
         
-        # Task queues by priority
-        self.task_queue = queue.PriorityQueue()
+        # Task queues by priority: one FIFO per level, scanned highest first
+        self.task_queues: Dict[TaskPriority, deque] = {p: deque() for p in sorted(TaskPriority)}
         self.active_tasks: Dict[str, Task] = {}
-        self.completed_tasks: List[Task] = []
-        self.failed_tasks: List[Task] = []
+        # Finished tasks by id, oldest first; only the last _FINISHED_HISTORY of each are kept
+        self.completed_tasks: 'OrderedDict[str, Task]' = OrderedDict()
+        self.failed_tasks: 'OrderedDict[str, Task]' = OrderedDict()
+        self.unfinished_tasks: Dict[str, Task] = {}  # Submitted but not yet completed/failed/cancelled
+        # Tasks waiting out a retry backoff: (ready_at monotonic, seq, task), drained by the dispatcher
+        self._retry_heap: List[Tuple[float, int, Task]] = []
+        self._retry_seq = itertools.count()
         
         # Control flags
         self.running = False
@@ -102,13 +129,20 @@ class TaskQueue:
             'completed_tasks': 0,
             'failed_tasks': 0,
             'retried_tasks': 0,
-            'average_execution_time': 0.0
+            'total_execution_time': 0.0
         }
         
-        # Thread safety
-        self.lock = threading.RLock()
+        # Thread safety; the dispatcher waits on a condition sharing the same lock,
+        # so popping a task and marking it running is one critical section. Not
+        # reentrant: nothing holding it calls back into locked methods or user callbacks
+        self.lock = threading.Lock()
+        self._queue_cond = threading.Condition(self.lock)
         
-        logger.info(f"TaskQueue initialized with {max_workers} workers")
+        logger.info(f"TaskQueue initialized with {self.max_workers} workers")
+    
+    def _create_executor(self) -> ThreadPoolExecutor:
+        """Create the shared worker pool"""
+        return ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="JARVIS-Worker")
     
     def start(self):
         """Start the task queue processing"""
@@ -145,6 +179,8 @@ class TaskQueue:
         logger.info("Stopping TaskQueue...")
         self.running = False
         self.shutdown_event.set()
+        with self._queue_cond:
+            self._queue_cond.notify_all()
         
         # Wait for threads to finish
         if self.dispatcher_thread:
@@ -153,8 +189,10 @@ class TaskQueue:
         if self.monitor_thread:
             self.monitor_thread.join(timeout=timeout/2)
         
-        # Shutdown executor
-        self.executor.shutdown(wait=True, timeout=timeout)
+        # Shutdown executor (ThreadPoolExecutor.shutdown takes no timeout); the
+        # replacement starts no threads until the queue is restarted
+        self.executor.shutdown(wait=True)
+        self.executor = self._create_executor()
         
         logger.info("TaskQueue stopped")
     
@@ -185,47 +223,57 @@ class TaskQueue:
             timeout=timeout
         )
         
-        with self.lock:
-            self.task_queue.put(task)
+        # One acquisition: the dispatcher's condition must be held to notify it anyway,
+        # so the stats counter rides along at no extra cost
+        with self._queue_cond:
+            self.unfinished_tasks[task.id] = task
+            self.task_queues[priority].append(task)
             self.stats['total_tasks'] += 1
+            self._queue_cond.notify()
         
-        logger.debug(f"Task submitted: {task.id} ({task.task_type.value}, priority={priority.name})")
+        # Hot-path debug logs use lazy %-formatting: nothing is built unless DEBUG is on
+        logger.debug("Task submitted: %s (%s, priority=%s)", task.id, task.task_type, priority.name)
         return task.id
     
     def get_task_status(self, task_id: str) -> Optional[TaskStatus]:
         """Get the status of a task"""
         with self.lock:
-            if task_id in self.active_tasks:
-                return self.active_tasks[task_id].status
-            
-            # Check completed tasks
-            for task in self.completed_tasks:
-                if task.id == task_id:
-                    return task.status
-            
-            # Check failed tasks
-            for task in self.failed_tasks:
-                if task.id == task_id:
-                    return task.status
-        
-        return None
+            task = (self.active_tasks.get(task_id) or self.completed_tasks.get(task_id)
+                    or self.failed_tasks.get(task_id))
+            return task.status if task is not None else None
     
     def get_task_result(self, task_id: str) -> Any:
         """Get the result of a completed task"""
         with self.lock:
-            # Check completed tasks
-            for task in self.completed_tasks:
-                if task.id == task_id:
-                    return task.result
-            
-            # Check active tasks
-            if task_id in self.active_tasks:
-                task = self.active_tasks[task_id]
-                if task.status == TaskStatus.COMPLETED:
-                    return task.result
+            task = self.completed_tasks.get(task_id) or self.active_tasks.get(task_id)
+            if task is not None and task.status == TaskStatus.COMPLETED:
+                return task.result
         
         return None
     
+    def wait_task(self, task_id: str, timeout: Optional[float] = None) -> Tuple[Optional[TaskStatus], Any]:
+        """Block until a task finishes or the timeout elapses; returns (status, result)"""
+        task = self.unfinished_tasks.get(task_id)  # Single dict read; atomic without the lock
+        
+        if task is None:
+            # Already finished (or unknown)
+            return self.get_task_status(task_id), self.get_task_result(task_id)
+        
+        task.done_event.wait(timeout)
+        with self.lock:
+            return task.status, (task.result if task.status == TaskStatus.COMPLETED else None)
+    
+    def _record_finished(self, finished: 'OrderedDict[str, Task]', task: Task):
+        """Add a task to a finished-task index, evicting the oldest past the cap (call with lock held)"""
+        finished[task.id] = task
+        if len(finished) > _FINISHED_HISTORY:
+            finished.popitem(last=False)
+    
+    def _finish_task(self, task: Task):
+        """Mark a task as finished and wake any waiters (call with lock held)"""
+        self.unfinished_tasks.pop(task.id, None)
+        task.done_event.set()
+    
     def cancel_task(self, task_id: str) -> bool:
         """Cancel a pending or running task"""
         with self.lock:
@@ -234,6 +282,7 @@ class TaskQueue:
                 if task.future and not task.future.done():
                     task.future.cancel()
                     task.status = TaskStatus.CANCELLED
+                    self._finish_task(task)
                     logger.info(f"Task cancelled: {task_id}")
                     return True
         
@@ -242,37 +291,69 @@ class TaskQueue:
     def get_queue_stats(self) -> Dict[str, Any]:
         """Get queue statistics"""
         with self.lock:
+            completed = self.stats['completed_tasks']
+            total_time = self.stats['total_execution_time']
             return {
                 **self.stats,
-                'queue_size': self.task_queue.qsize(),
+                'average_execution_time': total_time / completed if completed else 0.0,
+                'queue_size': self.pending_count(),
                 'active_tasks': len(self.active_tasks),
                 'worker_threads': self.max_workers
             }
     
+    def pending_count(self) -> int:
+        """Number of tasks waiting to be dispatched"""
+        return sum(len(q) for q in self.task_queues.values())
+    
+    def _release_due_retries(self, now: float) -> Optional[float]:
+        """Move retries whose backoff has elapsed onto their queues; returns seconds until the next one (call with lock held)"""
+        heap = self._retry_heap
+        while heap and heap[0][0] <= now:
+            _, _, task = heapq.heappop(heap)
+            logger.info(f"Retrying task: {task.id} (attempt {task.attempts + 1})")
+            task.status = TaskStatus.PENDING
+            self.task_queues[task.priority].append(task)
+        return heap[0][0] - now if heap else None
+    
+    def _pop_next_task(self) -> Optional[Task]:
+        """Pop the oldest task of the highest non-empty priority (call with lock held)"""
+        for pending in self.task_queues.values():
+            if pending:
+                return pending.popleft()
+        return None
+    
     def _dispatch_tasks(self):
         """Main dispatcher loop - runs in separate thread"""
         logger.info("Task dispatcher started")
         
         while self.running and not self.shutdown_event.is_set():
             try:
-                # Get next task (blocks with timeout)
-                try:
-                    task = self.task_queue.get(timeout=1.0)
-                except queue.Empty:
-                    continue
-                
-                # Submit task to executor
-                with self.lock:
-                    task.status = TaskStatus.RUNNING
-                    task.started_at = time.time()
-                    task.attempts += 1
-                    self.active_tasks[task.id] = task
+                # Take a batch of ready tasks in priority order (blocks with timeout)
+                # and mark them running, all in one critical section
+                batch = []
+                with self._queue_cond:
+                    next_retry = self._release_due_retries(time.monotonic())
+                    while len(batch) < _DISPATCH_BATCH:
+                        task = self._pop_next_task()
+                        if task is None:
+                            break
+                        batch.append(task)
+                    
+                    if not batch:
+                        self._queue_cond.wait(1.0 if next_retry is None else min(1.0, next_retry))
+                        continue
+                    
+                    started_at = time.monotonic()
+                    for task in batch:
+                        task.status = TaskStatus.RUNNING
+                        task.started_at = started_at
+                        task.attempts += 1
+                        self.active_tasks[task.id] = task
                 
                 # Submit to thread pool
-                future = self.executor.submit(self._execute_task, task)
-                task.future = future
-                
-                logger.debug(f"Task dispatched: {task.id} (attempt {task.attempts})")
+                for task in batch:
+                    task.future = self.executor.submit(self._execute_task, task)
+                    logger.debug("Task dispatched: %s (attempt %d)", task.id, task.attempts)
                 
             except Exception as e:
                 logger.error(f"Error in task dispatcher: {e}")
@@ -283,7 +364,7 @@ class TaskQueue:
     def _execute_task(self, task: Task) -> Any:
         """Execute a single task"""
         try:
-            logger.debug(f"Executing task: {task.id} ({task.task_type.value})")
+            logger.debug("Executing task: %s (%s)", task.id, task.task_type)
             
             # Execute the task function
             result = task.function(*task.args, **task.kwargs)
@@ -291,18 +372,16 @@ class TaskQueue:
             # Task completed successfully
             with self.lock:
                 task.status = TaskStatus.COMPLETED
-                task.completed_at = time.time()
+                task.completed_at = time.monotonic()
                 task.result = result
                 
                 # Move to completed tasks
                 if task.id in self.active_tasks:
                     del self.active_tasks[task.id]
-                self.completed_tasks.append(task)
+                self._record_finished(self.completed_tasks, task)
                 self.stats['completed_tasks'] += 1
-                
-                # Update average execution time
-                execution_time = task.completed_at - task.started_at
-                self._update_average_execution_time(execution_time)
+                self._finish_task(task)
+                self.stats['total_execution_time'] += task.completed_at - task.started_at
             
             # Call success callback
             if task.callback:
@@ -311,7 +390,7 @@ class TaskQueue:
                 except Exception as e:
                     logger.error(f"Error in task callback: {e}")
             
-            logger.debug(f"Task completed: {task.id}")
+            logger.debug("Task completed: %s", task.id)
             return result
             
         except Exception as e:
@@ -321,7 +400,8 @@ class TaskQueue:
                 task.error = e
                 
                 # Check if we should retry
-                if task.attempts < task.max_retries:
+                retry = task.attempts < task.max_retries
+                if retry:
                     task.status = TaskStatus.RETRYING
                     self.stats['retried_tasks'] += 1
                     
@@ -329,42 +409,36 @@ class TaskQueue:
                     if task.id in self.active_tasks:
                         del self.active_tasks[task.id]
                     
-                    # Schedule retry
-                    retry_thread = threading.Thread(
-                        target=self._schedule_retry,
-                        args=(task,),
-                        daemon=True
-                    )
-                    retry_thread.start()
+                    # Park it until the backoff elapses; the dispatcher re-queues it
+                    ready_at = time.monotonic() + self._retry_delay(task)
+                    heapq.heappush(self._retry_heap, (ready_at, next(self._retry_seq), task))
+                    self._queue_cond.notify()
                     
                 else:
                     # Max retries reached
                     task.status = TaskStatus.FAILED
-                    task.completed_at = time.time()
+                    task.completed_at = time.monotonic()
                     
                     # Move to failed tasks
                     if task.id in self.active_tasks:
                         del self.active_tasks[task.id]
-                    self.failed_tasks.append(task)
+                    self._record_finished(self.failed_tasks, task)
                     self.stats['failed_tasks'] += 1
-                    
-                    # Call error callback
-                    if task.error_callback:
-                        try:
-                            task.error_callback(e)
-                        except Exception as callback_error:
-                            logger.error(f"Error in error callback: {callback_error}")
+                    self._finish_task(task)
+            
+            # Call error callback (outside the lock, so it may submit tasks)
+            if not retry and task.error_callback:
+                try:
+                    task.error_callback(e)
+                except Exception as callback_error:
+                    logger.error(f"Error in error callback: {callback_error}")
             
             raise e
     
-    def _schedule_retry(self, task: Task):
-        """Schedule a task retry after delay"""
-        time.sleep(task.retry_delay)
-        
-        if self.running:
-            logger.info(f"Retrying task: {task.id} (attempt {task.attempts + 1})")
-            task.status = TaskStatus.PENDING
-            self.task_queue.put(task)
+    def _retry_delay(self, task: Task) -> float:
+        """Exponential backoff with full jitter, so tasks failing together don't retry in lockstep"""
+        backoff = min(task.max_retry_delay, task.retry_delay * (2 ** (task.attempts - 1)))
+        return _retry_random.uniform(0, backoff * task.jitter_factor)
     
     def _monitor_tasks(self):
         """Monitor task timeouts and cleanup - runs in separate thread"""
@@ -372,7 +446,7 @@ class TaskQueue:
         
         while self.running and not self.shutdown_event.is_set():
             try:
-                current_time = time.time()
+                current_time = time.monotonic()
                 timed_out_tasks = []
                 
                 with self.lock:
@@ -394,16 +468,9 @@ class TaskQueue:
                         
                         if task.id in self.active_tasks:
                             del self.active_tasks[task.id]
-                        self.failed_tasks.append(task)
+                        self._record_finished(self.failed_tasks, task)
                         self.stats['failed_tasks'] += 1
-                
-                # Cleanup old completed/failed tasks (keep last 100)
-                with self.lock:
-                    if len(self.completed_tasks) > 100:
-                        self.completed_tasks = self.completed_tasks[-100:]
-                    
-                    if len(self.failed_tasks) > 100:
-                        self.failed_tasks = self.failed_tasks[-100:]
+                        self._finish_task(task)
                 
                 time.sleep(5.0)  # Check every 5 seconds
                 
@@ -412,22 +479,13 @@ class TaskQueue:
                 time.sleep(1.0)
         
         logger.info("Task monitor stopped")
-    
-    def _update_average_execution_time(self, execution_time: float):
-        """Update average execution time statistic"""
-        current_avg = self.stats['average_execution_time']
-        completed_count = self.stats['completed_tasks']
-        
-        if completed_count == 1:
-            self.stats['average_execution_time'] = execution_time
-        else:
-            # Running average
-            self.stats['average_execution_time'] = (
-                (current_avg * (completed_count - 1) + execution_time) / completed_count
-            )
+
+def default_worker_count() -> int:
+    """Worker pool size: one per CPU, but never fewer than the previous fixed 6"""
+    return max(6, os.cpu_count() or 1)
 
 # Global task queue instance
-task_queue = TaskQueue(max_workers=6)
+task_queue = TaskQueue()
 
 # Convenience functions
 def submit_task(task_type: TaskType, function: Callable, *args, **kwargs) -> str:
@@ -441,3 +499,7 @@ def get_task_status(task_id: str) -> Optional[TaskStatus]:
 def get_task_result(task_id: str) -> Any:
     """Get task result from global queue"""
     return task_queue.get_task_result(task_id)
+
+def wait_task(task_id: str, timeout: Optional[float] = None) -> Tuple[Optional[TaskStatus], Any]:
+    """Wait for a task in the global queue to finish"""
+    return task_queue.wait_task(task_id, timeout)
@@ -3,30 +3,232 @@ JARVIS OpenAI Integration - Advanced conversations with GPT-4o-mini via OpenRout
 """
 
 import os
+import json
+import asyncio
+import contextlib
+import contextvars
+import hashlib
+import importlib.util
 import logging
-import base64
-import io
-from typing import Optional, Dict, Any, List
-from openai import OpenAI
-from PIL import Image
+import binascii
+import threading
+import re
+import time
+from collections import OrderedDict, deque
+from typing import Optional, Dict, Any, List, Callable
+from openai import OpenAI, AsyncOpenAI
 import cv2
 import numpy as np
 
+try:
+    import httpx  # type: ignore
+except Exception:  # pragma: no cover - installed with openai
+    httpx = None
+
+try:
+    import h2  # type: ignore  # noqa: F401  (enables HTTP/2 in httpx)
+    _HTTP2_AVAILABLE = True
+except Exception:  # pragma: no cover - optional dependency
+    _HTTP2_AVAILABLE = False
+
+try:
+    import tiktoken  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    tiktoken = None
+
 logger = logging.getLogger(__name__)
 
+_BASE_URL = "https://openrouter.ai/api/v1"
+
+# OpenRouter attribution headers, sent with every request
+_EXTRA_HEADERS = {
+    "HTTP-Referer": "https://jarvis-ai-assistant.local",
+    "X-Title": "JARVIS AI Assistant",
+}
+
+_RESPONSE_CACHE_SIZE = 256
+
+# Longest image side sent for vision analysis
+_VISION_MAX_SIDE = 1024
+_VISION_JPEG_PARAMS = [cv2.IMWRITE_JPEG_QUALITY, 80, cv2.IMWRITE_JPEG_PROGRESSIVE, 1]
+
+# Token budget for replayed conversation history (system prompt and new message excluded)
+_HISTORY_TOKEN_BUDGET = 3000
+
+_encoding = None
+_encoding_loaded = False
+
+def _count_tokens(text: str) -> int:
+    """Token count via tiktoken when available, else a ~4 chars/token estimate"""
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        _encoding_loaded = True
+        if tiktoken is not None:
+            try:
+                _encoding = tiktoken.encoding_for_model("gpt-4o-mini")
+            except Exception as e:
+                logger.debug(f"tiktoken encoding unavailable, estimating tokens: {e}")
+    if _encoding is not None:
+        return len(_encoding.encode(text))
+    return len(text) // 4 + 1
+
+# Near-duplicate prompt cache for get_smart_response
+_SEMANTIC_CACHE_SIZE = 40
+_SEMANTIC_THRESHOLD = 0.92
+_SEMANTIC_TTL = 300.0       # Seconds; answers about "now" go stale
+_SEMANTIC_MIN_WORDS = 3     # Shorter prompts ("why?") depend on the conversation
+_SEMANTIC_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+_NUMBER_PATTERN = re.compile(r"\d+(?:\.\d+)?")
+_VOLATILE_CONTEXT_KEYS = frozenset(("current_time", "timestamp"))  # Change every call; not part of the guard
+
+_embedder = None
+_embedder_warmup_started = False
+_embedder_lock = threading.Lock()
+
+def _load_embedder():
+    """Load the sentence embedder (may download the model); runs on a background thread"""
+    global _embedder
+    try:
+        # Imported here: sentence_transformers pulls in torch and transformers
+        from sentence_transformers import SentenceTransformer  # type: ignore
+        _embedder = SentenceTransformer(_SEMANTIC_MODEL)
+        logger.info("Sentence embedder loaded; semantic cache enabled")
+    except Exception as e:
+        logger.warning(f"Sentence embedder unavailable, semantic cache disabled: {e}")
+
+def warm_up_embedder():
+    """Start loading the sentence embedder in the background (once)"""
+    global _embedder_warmup_started
+    if importlib.util.find_spec("sentence_transformers") is None:
+        return
+    with _embedder_lock:
+        if _embedder_warmup_started:
+            return
+        _embedder_warmup_started = True
+    threading.Thread(target=_load_embedder, name="JARVIS-EmbedderWarmup", daemon=True).start()
+
+def _embed(text: str) -> Optional[np.ndarray]:
+    """Unit-length float32 sentence embedding, or None until the embedder has loaded"""
+    if _embedder is None:
+        warm_up_embedder()  # First eligible prompt starts the load; cached lookups begin once it lands
+        return None  # Never block a request on the model load
+    
+    vector = np.asarray(_embedder.encode(text), dtype=np.float32)
+    norm = float(np.linalg.norm(vector))
+    return vector / norm if norm else vector
+
+def _semantic_guard(command: str, system_context: Optional[Dict[str, Any]]) -> tuple:
+    """Exact-match part of a semantic cache key: the prompt's numbers and the stable context.
+    
+    Clock fields are left out since they change every call. So is the conversation
+    history: it grows with every exchange, and prompts short enough to lean on it
+    are below _SEMANTIC_MIN_WORDS anyway.
+    """
+    stable = {key: value for key, value in (system_context or {}).items()
+              if key not in _VOLATILE_CONTEXT_KEYS}
+    return tuple(_NUMBER_PATTERN.findall(command)), _cache_key(stable)
+
+class _SemanticCache:
+    """Small LRU of (prompt embedding, response), matched by cosine similarity.
+    
+    Entries also carry a guard that must match exactly: the numbers in the prompt
+    ("what is 5 plus 7" and "what is 5 plus 8" embed almost identically) and a
+    digest of the stable system context fields (see _semantic_guard).
+    """
+    
+    def __init__(self, size: int = _SEMANTIC_CACHE_SIZE, threshold: float = _SEMANTIC_THRESHOLD,
+                 ttl: float = _SEMANTIC_TTL):
+        self.size = size
+        self.threshold = threshold
+        self.ttl = ttl
+        self._embeddings: Optional[np.ndarray] = None   # (n, dim) stacked rows, unit length
+        self._responses: List[str] = []
+        self._guards: List[tuple] = []
+        self._stored_at: List[float] = []
+        self._last_used: List[float] = []
+        self._lock = threading.Lock()
+    
+    def get(self, embedding: np.ndarray, guard: tuple) -> Optional[str]:
+        """Response cached for the most similar fresh prompt above the threshold"""
+        with self._lock:
+            if self._embeddings is None or embedding.shape[0] != self._embeddings.shape[1]:
+                return None
+            now = time.monotonic()
+            similarities = self._embeddings @ embedding
+            for i in np.argsort(similarities)[::-1]:
+                if similarities[i] < self.threshold:
+                    break
+                if self._guards[i] == guard and now - self._stored_at[i] <= self.ttl:
+                    self._last_used[i] = now
+                    return self._responses[i]
+            return None
+    
+    def put(self, embedding: np.ndarray, guard: tuple, response: str):
+        """Cache a response, evicting the least recently used entry when full"""
+        with self._lock:
+            now = time.monotonic()
+            if self._embeddings is None or embedding.shape[0] != self._embeddings.shape[1]:
+                self._embeddings = embedding[np.newaxis, :].copy()
+                self._responses, self._guards = [response], [guard]
+                self._stored_at, self._last_used = [now], [now]
+                return
+            
+            if len(self._responses) < self.size:
+                self._embeddings = np.vstack((self._embeddings, embedding))
+                self._responses.append(response)
+                self._guards.append(guard)
+                self._stored_at.append(now)
+                self._last_used.append(now)
+            else:
+                i = int(np.argmin(self._last_used))
+                self._embeddings[i] = embedding
+                self._responses[i] = response
+                self._guards[i] = guard
+                self._stored_at[i] = now
+                self._last_used[i] = now
+    
+    def clear(self):
+        """Drop all entries"""
+        with self._lock:
+            self._embeddings = None
+            self._responses, self._guards, self._stored_at, self._last_used = [], [], [], []
+
+_http_client = None
+_http_client_lock = threading.Lock()
+
+def _get_http_client():
+    """Shared keep-alive HTTP client, so every OpenAI client reuses one TLS connection pool"""
+    global _http_client
+    if _http_client is None and httpx is not None:
+        with _http_client_lock:
+            if _http_client is None:
+                _http_client = httpx.Client(
+                    http2=_HTTP2_AVAILABLE,
+                    timeout=30.0,
+                    limits=httpx.Limits(max_keepalive_connections=16, max_connections=32)
+                )
+    return _http_client
+
+# Async client for the running run_parallel() batch; AsyncOpenAI is bound to one event loop
+_async_client_var: contextvars.ContextVar = contextvars.ContextVar("openai_async_client", default=None)
+
+def _cache_key(*parts: Any) -> str:
+    """Stable digest of a request's parameters (not used for security)"""
+    payload = json.dumps(parts, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
 class OpenAIIntegration:
     """OpenAI integration for advanced conversations and vision"""
     
     def __init__(self):
-        self.api_key = "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"
-        self.base_url = "https://openrouter.ai/api/v1"
+        # OpenRouter key from the environment (OPENAI_API_KEY is what deploy/.env set)
+        self.api_key = os.getenv("OPENROUTER_API_KEY") or os.getenv("OPENAI_API_KEY")
+        self.base_url = _BASE_URL
         self.model = "openai/gpt-4o-mini"
         
-        # Initialize client
-        self.client = OpenAI(
-            base_url=self.base_url,
-            api_key=self.api_key
-        )
+        # Client is created on first request
+        self._client = None
+        self._client_lock = threading.Lock()
         
         # JARVIS personality and context
         self.system_prompt = """You are JARVIS, an advanced AI assistant inspired by Tony Stark's AI from Iron Man. You are:
@@ -49,60 +251,201 @@ You have access to:
 
 Respond in JARVIS's characteristic style - professional yet personable, intelligent yet accessible. Keep responses concise but informative unless asked for detailed explanations."""
         
-        # Conversation history
+        self._system_message = {"role": "system", "content": self.system_prompt}
+        
+        # Conversation history, trimmed to max_history exchanges and the token budget.
+        # _history_messages mirrors it as ready-to-send chat messages (two per exchange)
         self.conversation_history: List[Dict[str, str]] = []
         self.max_history = 10  # Keep last 10 exchanges
+        self.history_token_budget = _HISTORY_TOKEN_BUDGET
+        self._history_messages: List[Dict[str, str]] = []
+        self._history_token_counts: deque = deque()
+        self._history_tokens = 0
+        
+        # Bounded LRU of completed responses, keyed by request digest
+        self._response_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        
+        # Near-duplicate command cache for get_smart_response
+        self._semantic_cache = _SemanticCache()
+        
+        # Per-thread resize output, reused while the camera resolution stays the same
+        self._encode_scratch = threading.local()
         
         logger.info("OpenAI Integration initialized with GPT-4o-mini via OpenRouter")
     
-    def chat(self, message: str, context: Optional[Dict[str, Any]] = None) -> str:
+    @property
+    def client(self) -> OpenAI:
+        """OpenAI client bound to the shared HTTP connection pool"""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    if not self.api_key:
+                        raise RuntimeError("OPENROUTER_API_KEY (or OPENAI_API_KEY) is not set")
+                    self._client = OpenAI(
+                        base_url=self.base_url,
+                        api_key=self.api_key,
+                        http_client=_get_http_client()
+                    )
+        return self._client
+    
+    def _new_async_client(self) -> AsyncOpenAI:
+        """Create an AsyncOpenAI client; the caller must close it"""
+        if not self.api_key:
+            raise RuntimeError("OPENROUTER_API_KEY (or OPENAI_API_KEY) is not set")
+        http_client = None
+        if httpx is not None:
+            http_client = httpx.AsyncClient(
+                http2=_HTTP2_AVAILABLE,
+                timeout=30.0,
+                limits=httpx.Limits(max_keepalive_connections=16, max_connections=32)
+            )
+        return AsyncOpenAI(base_url=self.base_url, api_key=self.api_key, http_client=http_client)
+    
+    @contextlib.asynccontextmanager
+    async def _async_client(self):
+        """Yield the run_parallel() batch client, or a one-off client closed on exit"""
+        client = _async_client_var.get()
+        if client is not None:
+            yield client
+            return
+        
+        client = self._new_async_client()
+        try:
+            yield client
+        finally:
+            await client.close()
+    
+    def _cache_get(self, key: str) -> Optional[str]:
+        """Look up a cached response, marking it most recently used"""
+        with self._cache_lock:
+            response = self._response_cache.get(key)
+            if response is not None:
+                self._response_cache.move_to_end(key)
+            return response
+    
+    def _cache_put(self, key: str, response: str):
+        """Store a response, evicting the least recently used entry when full"""
+        with self._cache_lock:
+            self._response_cache[key] = response
+            self._response_cache.move_to_end(key)
+            if len(self._response_cache) > _RESPONSE_CACHE_SIZE:
+                self._response_cache.popitem(last=False)
+    
+    def clear_response_cache(self):
+        """Drop all memoized responses"""
+        with self._cache_lock:
+            self._response_cache.clear()
+        self._semantic_cache.clear()
+    
+    def _build_messages(self, message: str, context: Optional[Dict[str, Any]] = None):
+        """Build the request messages; returns (messages, user message as sent)"""
+        message = self._with_context(message, context)
+        messages = [self._system_message, *self._history_messages, {"role": "user", "content": message}]
+        return messages, message
+    
+    def _with_context(self, message: str, context: Optional[Dict[str, Any]] = None) -> str:
+        """User message as sent, with the context prepended if provided"""
+        if context:
+            context_str = self._format_context(context)
+            message = f"Context: {context_str}\n\nUser: {message}"
+        return message
+    
+    def _remember(self, message: str, response: str):
+        """Store an exchange in the bounded conversation history"""
+        self.conversation_history.append({
+            "user": message,
+            "assistant": response
+        })
+        self._history_messages.append({"role": "user", "content": message})
+        self._history_messages.append({"role": "assistant", "content": response})
+        tokens = _count_tokens(message) + _count_tokens(response)
+        self._history_token_counts.append(tokens)
+        self._history_tokens += tokens
+        
+        # Evict the oldest exchanges past the exchange cap or token budget (always keep the newest)
+        while len(self.conversation_history) > 1 and (
+                len(self.conversation_history) > self.max_history
+                or self._history_tokens > self.history_token_budget):
+            self.conversation_history.pop(0)
+            del self._history_messages[:2]
+            self._history_tokens -= self._history_token_counts.popleft()
+    
+    def chat(self, message: str, context: Optional[Dict[str, Any]] = None,
+             temperature: float = 0.7, cacheable: bool = False) -> str:
         """Have a conversation with GPT-4o-mini"""
         try:
-            # Build messages
-            messages = [{"role": "system", "content": self.system_prompt}]
+            messages, message = self._build_messages(message, context)
             
-            # Add conversation history
-            for exchange in self.conversation_history[-self.max_history:]:
-                messages.append({"role": "user", "content": exchange["user"]})
-                messages.append({"role": "assistant", "content": exchange["assistant"]})
+            # Deterministic (or explicitly cacheable) prompts are memoized
+            cache_key = None
+            response = None
+            if cacheable or temperature == 0:
+                cache_key = _cache_key(self.model, messages, 500, temperature)
+                response = self._cache_get(cache_key)
             
-            # Add context if provided
-            if context:
-                context_str = self._format_context(context)
-                message = f"Context: {context_str}\n\nUser: {message}"
+            if response is None:
+                # Make API call
+                completion = self.client.chat.completions.create(
+                    extra_headers=_EXTRA_HEADERS,
+                    model=self.model,
+                    messages=messages,
+                    max_tokens=500,
+                    temperature=temperature
+                )
+                
+                response = completion.choices[0].message.content
+                if cache_key is not None and response:
+                    self._cache_put(cache_key, response)
+            else:
+                logger.debug("OpenAI chat served from response cache")
             
-            # Add current message
-            messages.append({"role": "user", "content": message})
+            self._remember(message, response)
+            
+            logger.info(f"OpenAI chat completed: {len(response)} characters")
+            return response
+            
+        except Exception as e:
+            logger.error(f"OpenAI chat error: {e}")
+            return f"I apologize, but I'm experiencing some technical difficulties with my advanced reasoning systems. Error: {str(e)}"
+    
+    def chat_stream(self, message: str, on_chunk: Callable[[str], None],
+                    context: Optional[Dict[str, Any]] = None) -> str:
+        """Chat with streamed output, passing each text delta to on_chunk as it arrives"""
+        parts: List[str] = []
+        try:
+            messages, message = self._build_messages(message, context)
             
-            # Make API call
             completion = self.client.chat.completions.create(
-                extra_headers={
-                    "HTTP-Referer": "https://jarvis-ai-assistant.local",
-                    "X-Title": "JARVIS AI Assistant",
-                },
+                extra_headers=_EXTRA_HEADERS,
                 model=self.model,
                 messages=messages,
                 max_tokens=500,
-                temperature=0.7
+                temperature=0.7,
+                stream=True
             )
             
-            response = completion.choices[0].message.content
-            
-            # Store in conversation history
-            self.conversation_history.append({
-                "user": message,
-                "assistant": response
-            })
+            for chunk in completion:
+                if not chunk.choices:
+                    continue
+                piece = chunk.choices[0].delta.content
+                if piece:
+                    parts.append(piece)
+                    try:
+                        on_chunk(piece)
+                    except Exception as e:
+                        logger.error(f"Error in chat chunk callback: {e}")
             
-            # Limit history size
-            if len(self.conversation_history) > self.max_history:
-                self.conversation_history = self.conversation_history[-self.max_history:]
+            response = "".join(parts)
+            self._remember(message, response)
             
-            logger.info(f"OpenAI chat completed: {len(response)} characters")
+            logger.info(f"OpenAI streamed chat completed: {len(response)} characters")
             return response
             
         except Exception as e:
-            logger.error(f"OpenAI chat error: {e}")
+            logger.error(f"OpenAI streamed chat error: {e}")
+            if parts:
+                return "".join(parts)
             return f"I apologize, but I'm experiencing some technical difficulties with my advanced reasoning systems. Error: {str(e)}"
     
     def analyze_image(self, image_data: np.ndarray, question: str = "What do you see in this image?") -> str:
@@ -111,30 +454,17 @@ Respond in JARVIS's characteristic style - professional yet personable, intellig
             # Convert numpy array to base64
             image_base64 = self._numpy_to_base64(image_data)
             
-            messages = [
-                {"role": "system", "content": self.system_prompt},
-                {
-                    "role": "user",
-                    "content": [
-                        {
-                            "type": "text",
-                            "text": f"As JARVIS, analyze this image from my camera feed and answer: {question}"
-                        },
-                        {
-                            "type": "image_url",
-                            "image_url": {
-                                "url": f"data:image/jpeg;base64,{image_base64}"
-                            }
-                        }
-                    ]
-                }
-            ]
+            # A repeated question about an unchanged scene skips the round-trip
+            cache_key = self._vision_cache_key(image_base64, question)
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                logger.debug("OpenAI image analysis served from response cache")
+                return cached
+            
+            messages = self._vision_messages(image_base64, question)
             
             completion = self.client.chat.completions.create(
-                extra_headers={
-                    "HTTP-Referer": "https://jarvis-ai-assistant.local",
-                    "X-Title": "JARVIS AI Assistant",
-                },
+                extra_headers=_EXTRA_HEADERS,
                 model=self.model,
                 messages=messages,
                 max_tokens=300,
@@ -142,6 +472,8 @@ Respond in JARVIS's characteristic style - professional yet personable, intellig
             )
             
             response = completion.choices[0].message.content
+            if response:
+                self._cache_put(cache_key, response)
             logger.info("OpenAI image analysis completed")
             return response
             
@@ -149,8 +481,123 @@ Respond in JARVIS's characteristic style - professional yet personable, intellig
             logger.error(f"OpenAI image analysis error: {e}")
             return f"I'm having trouble analyzing the image at the moment. Error: {str(e)}"
     
-    def get_smart_response(self, command: str, system_context: Optional[Dict[str, Any]] = None) -> str:
-        """Get an intelligent response for any command"""
+    def _vision_cache_key(self, image_base64: str, question: str) -> str:
+        """Cache key for an image question: digest of the encoded frame plus the question"""
+        image_digest = hashlib.blake2b(image_base64.encode('ascii'), digest_size=16).hexdigest()
+        return _cache_key(self.model, question, image_digest)
+    
+    def _vision_messages(self, image_base64: str, question: str) -> List[Dict[str, Any]]:
+        """Build the request messages for an image question"""
+        return [
+            self._system_message,
+            {
+                "role": "user",
+                "content": [
+                    {
+                        "type": "text",
+                        "text": f"As JARVIS, analyze this image from my camera feed and answer: {question}"
+                    },
+                    {
+                        "type": "image_url",
+                        "image_url": {
+                            "url": f"data:image/jpeg;base64,{image_base64}"
+                        }
+                    }
+                ]
+            }
+        ]
+    
+    async def achat(self, message: str, context: Optional[Dict[str, Any]] = None,
+                    temperature: float = 0.7, cacheable: bool = False) -> str:
+        """Async version of chat(), for running alongside other requests"""
+        try:
+            messages, message = self._build_messages(message, context)
+            
+            cache_key = None
+            response = None
+            if cacheable or temperature == 0:
+                cache_key = _cache_key(self.model, messages, 500, temperature)
+                response = self._cache_get(cache_key)
+            
+            if response is None:
+                async with self._async_client() as client:
+                    completion = await client.chat.completions.create(
+                        extra_headers=_EXTRA_HEADERS,
+                        model=self.model,
+                        messages=messages,
+                        max_tokens=500,
+                        temperature=temperature
+                    )
+                
+                response = completion.choices[0].message.content
+                if cache_key is not None and response:
+                    self._cache_put(cache_key, response)
+            
+            self._remember(message, response)
+            
+            logger.info(f"OpenAI async chat completed: {len(response)} characters")
+            return response
+            
+        except Exception as e:
+            logger.error(f"OpenAI async chat error: {e}")
+            return f"I apologize, but I'm experiencing some technical difficulties with my advanced reasoning systems. Error: {str(e)}"
+    
+    async def aanalyze_image(self, image_data: np.ndarray, question: str = "What do you see in this image?") -> str:
+        """Async version of analyze_image()"""
+        try:
+            # Encoding is CPU work; keep it off the event loop (asyncio.to_thread needs 3.9)
+            loop = asyncio.get_running_loop()
+            image_base64 = await loop.run_in_executor(None, self._numpy_to_base64, image_data)
+            
+            cache_key = self._vision_cache_key(image_base64, question)
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                return cached
+            
+            async with self._async_client() as client:
+                completion = await client.chat.completions.create(
+                    extra_headers=_EXTRA_HEADERS,
+                    model=self.model,
+                    messages=self._vision_messages(image_base64, question),
+                    max_tokens=300,
+                    temperature=0.7
+                )
+            
+            response = completion.choices[0].message.content
+            if response:
+                self._cache_put(cache_key, response)
+            logger.info("OpenAI async image analysis completed")
+            return response
+            
+        except Exception as e:
+            logger.error(f"OpenAI async image analysis error: {e}")
+            return f"I'm having trouble analyzing the image at the moment. Error: {str(e)}"
+    
+    def run_parallel(self, *coros) -> List[Any]:
+        """Run independent achat/aanalyze_image calls concurrently; returns results in order"""
+        # Blocks only for the slowest request, so a batch submitted as one task holds one worker
+        return asyncio.run(self._gather(coros))
+    
+    async def _gather(self, coros) -> List[Any]:
+        """Gather coroutines sharing one async client, closed when the batch ends"""
+        try:
+            client = self._new_async_client()
+        except Exception:
+            for coro in coros:
+                coro.close()
+            raise
+        
+        # Tasks created by gather() copy this context, so every call sees the batch client
+        token = _async_client_var.set(client)
+        try:
+            return list(await asyncio.gather(*coros))
+        finally:
+            _async_client_var.reset(token)
+            await client.close()
+    
+    def get_smart_response(self, command: str, system_context: Optional[Dict[str, Any]] = None,
+                           on_chunk: Optional[Callable[[str], None]] = None) -> str:
+        """Get an intelligent response for any command (streamed to on_chunk if given)"""
         try:
             # Enhanced context for better responses
             context = {
@@ -166,7 +613,29 @@ Respond in JARVIS's characteristic style - professional yet personable, intellig
             if system_context:
                 context.update(system_context)
             
-            return self.chat(command, context)
+            # A near-duplicate of a recent command, asked in the same system context, reuses its answer
+            embedding = None
+            guard = None
+            if len(command.split()) >= _SEMANTIC_MIN_WORDS:
+                embedding = _embed(command)
+            if embedding is not None:
+                guard = _semantic_guard(command, system_context)
+                cached = self._semantic_cache.get(embedding, guard)
+                if cached is not None:
+                    logger.debug("Smart response served from semantic cache")
+                    self._remember(self._with_context(command, context), cached)
+                    if on_chunk is not None:
+                        on_chunk(cached)
+                    return cached
+            
+            if on_chunk is not None:
+                response = self.chat_stream(command, on_chunk, context)
+            else:
+                response = self.chat(command, context)
+            
+            if embedding is not None and response and not response.startswith("I apologize"):
+                self._semantic_cache.put(embedding, guard, response)
+            return response
             
         except Exception as e:
             logger.error(f"Smart response error: {e}")
@@ -205,20 +674,25 @@ Provide clean, well-commented code that follows best practices. Include brief ex
             return f"I'm having trouble generating the code. Error: {str(e)}"
     
     def _numpy_to_base64(self, image_array: np.ndarray) -> str:
-        """Convert numpy array to base64 string"""
-        # Convert BGR to RGB if needed
-        if len(image_array.shape) == 3 and image_array.shape[2] == 3:
-            image_array = cv2.cvtColor(image_array, cv2.COLOR_BGR2RGB)
-        
-        # Convert to PIL Image
-        pil_image = Image.fromarray(image_array)
+        """Convert a BGR numpy frame to base64 JPEG, downscaled for the vision model"""
+        # The model resizes large images itself, so don't encode or upload extra pixels
+        h, w = image_array.shape[:2]
+        scale = _VISION_MAX_SIDE / max(h, w)
+        if scale < 1.0:
+            size = (max(1, int(w * scale)), max(1, int(h * scale)))
+            scratch = getattr(self._encode_scratch, 'resized', None)
+            if (scratch is None or scratch.shape[:2] != (size[1], size[0])
+                    or scratch.shape[2:] != image_array.shape[2:] or scratch.dtype != image_array.dtype):
+                scratch = np.empty((size[1], size[0]) + image_array.shape[2:], dtype=image_array.dtype)
+                self._encode_scratch.resized = scratch
+            image_array = cv2.resize(image_array, size, dst=scratch, interpolation=cv2.INTER_AREA)
         
-        # Convert to base64
-        buffer = io.BytesIO()
-        pil_image.save(buffer, format='JPEG', quality=85)
-        image_base64 = base64.b64encode(buffer.getvalue()).decode('utf-8')
+        # OpenCV encodes BGR frames natively, so no colour conversion or PIL copy is needed
+        ok, buffer = cv2.imencode('.jpg', image_array, _VISION_JPEG_PARAMS)
+        if not ok:
+            raise ValueError("JPEG encoding failed")
         
-        return image_base64
+        return binascii.b2a_base64(buffer, newline=False).decode('ascii')
     
     def _format_context(self, context: Dict[str, Any]) -> str:
         """Format context dictionary into readable string"""
@@ -240,6 +714,9 @@ Provide clean, well-commented code that follows best practices. Include brief ex
     def clear_history(self):
         """Clear conversation history"""
         self.conversation_history = []
+        self._history_messages = []
+        self._history_token_counts.clear()
+        self._history_tokens = 0
         logger.info("Conversation history cleared")
     
     def get_conversation_summary(self) -> str:
@@ -268,10 +745,17 @@ Provide a brief summary of the main topics discussed and any important informati
 
 # Global OpenAI integration instance
 openai_integration = None
+_openai_integration_lock = threading.Lock()
 
 def get_openai_integration() -> OpenAIIntegration:
     """Get global OpenAI integration instance"""
     global openai_integration
-    if openai_integration is None:
-        openai_integration = OpenAIIntegration()
-    return openai_integration
+    instance = openai_integration
+    if instance is not None:
+        return instance
+    
+    # First use: construct exactly once even if several workers race here
+    with _openai_integration_lock:
+        if openai_integration is None:
+            openai_integration = OpenAIIntegration()
+        return openai_integration
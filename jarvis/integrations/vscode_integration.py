@@ -4,22 +4,77 @@ JARVIS VS Code Integration - Workspace control and code assistance
 
 import os
 import json
+import shutil
 import subprocess
 import logging
-from typing import Dict, Any, List, Optional
+import threading
+import time
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+from collections import OrderedDict
+from functools import cached_property
 from pathlib import Path
 
+# Optional dependency: orjson parses ripgrep's JSON output faster than the stdlib json module
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
 logger = logging.getLogger(__name__)
 
+DEFAULT_EXTENSIONS = ('.py', '.js', '.ts', '.html', '.css', '.md', '.txt', '.json')
+
+# Seconds a workspace search may run before it is abandoned
+_SEARCH_TIMEOUT = 30.0
+
+# How long a launch waits for the `code` CLI to exit before reporting it as started
+_SPAWN_WAIT = 0.25
+
+# Seconds an installed-extensions listing is reused (each listing starts Electron)
+_EXTENSIONS_TTL = 60.0
+
+# Directories never worth descending into (hidden ones are skipped too)
+_IGNORED_DIRS = frozenset(('node_modules', '__pycache__', '.git', '.venv', 'venv'))
+
+def _log_search_errors(tool: str, result: subprocess.CompletedProcess) -> None:
+    """Log a search failure; rg and grep both exit 2 on errors (1 only means no matches)"""
+    if result.returncode >= 2:
+        stderr = result.stderr
+        if isinstance(stderr, bytes):
+            stderr = stderr.decode('utf-8', 'replace')
+        logger.error(f"{tool} search failed (exit {result.returncode}): {stderr.strip()}")
+
 class VSCodeIntegration:
     """VS Code integration for workspace control and code assistance"""
     
     def __init__(self):
-        self.vscode_command = self._find_vscode_command()
+        # vscode_command, _vscode_available and _rg_command resolve on first use
         self.current_workspace = None
-        self.recent_files = []
+        self.recent_files: 'OrderedDict[str, None]' = OrderedDict()  # Oldest first; last 10 opened
         
-        logger.info(f"VS Code integration initialized with command: {self.vscode_command}")
+        # Directory listings keyed by path: (mtime_ns, file paths, subdirectory paths).
+        # A stat is far cheaper than a readdir, so unchanged directories are never re-read
+        self._dir_cache: Dict[str, Tuple[int, List[str], List[str]]] = {}
+        self._extensions_cache: Optional[Tuple[float, List[str]]] = None  # (monotonic time, extensions)
+        
+        logger.info("VS Code integration initialized")
+    
+    @cached_property
+    def vscode_command(self) -> str:
+        """VS Code executable, looked up on first use"""
+        command = self._find_vscode_command()
+        logger.info(f"Using VS Code command: {command}")
+        return command
+    
+    @cached_property
+    def _vscode_available(self) -> bool:
+        """Whether the VS Code command resolves on PATH"""
+        return shutil.which(self.vscode_command) is not None
+    
+    @cached_property
+    def _rg_command(self) -> Optional[str]:
+        """ripgrep executable for multi-threaded search, if installed"""
+        return shutil.which('rg')
     
     def _find_vscode_command(self) -> str:
         """Find the VS Code command on the system"""
@@ -32,16 +87,11 @@ class VSCodeIntegration:
             '/opt/visual-studio-code/bin/code'
         ]
         
+        # PATH/executable lookup only; launching Electron just to run --version costs seconds
         for cmd in possible_commands:
-            try:
-                result = subprocess.run([cmd, '--version'], 
-                                      capture_output=True, 
-                                      text=True, 
-                                      timeout=5)
-                if result.returncode == 0:
-                    return cmd
-            except (subprocess.TimeoutExpired, FileNotFoundError):
-                continue
+            resolved = shutil.which(cmd)
+            if resolved:
+                return resolved
         
         return 'code'  # Default fallback
     
@@ -55,17 +105,15 @@ class VSCodeIntegration:
                 return False
             
             # Open in VS Code
-            result = subprocess.run([
-                self.vscode_command, 
-                str(workspace_path)
-            ], capture_output=True, text=True)
+            ok, error = self._spawn_vscode([str(workspace_path)])
             
-            if result.returncode == 0:
+            if ok:
                 self.current_workspace = str(workspace_path)
+                self.invalidate_cache()
                 logger.info(f"Opened workspace: {workspace_path}")
                 return True
             else:
-                logger.error(f"Failed to open workspace: {result.stderr}")
+                logger.error(f"Failed to open workspace: {error}")
                 return False
                 
         except Exception as e:
@@ -81,31 +129,58 @@ class VSCodeIntegration:
                 logger.error(f"File does not exist: {file_path}")
                 return False
             
-            # Build command
-            cmd = [self.vscode_command, str(file_path)]
+            # Build arguments
+            args = [str(file_path)]
             
             # Add line number if specified
             if line_number:
-                cmd.extend(['--goto', f"{file_path}:{line_number}"])
+                args.extend(['--goto', f"{file_path}:{line_number}"])
             
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            ok, error = self._spawn_vscode(args)
             
-            if result.returncode == 0:
-                # Add to recent files
-                if str(file_path) not in self.recent_files:
-                    self.recent_files.insert(0, str(file_path))
-                    self.recent_files = self.recent_files[:10]  # Keep last 10
+            if ok:
+                # Add to recent files, moving a reopened file to the front
+                key = str(file_path)
+                self.recent_files.pop(key, None)
+                self.recent_files[key] = None
+                if len(self.recent_files) > 10:  # Keep last 10
+                    self.recent_files.popitem(last=False)
                 
                 logger.info(f"Opened file: {file_path}")
                 return True
             else:
-                logger.error(f"Failed to open file: {result.stderr}")
+                logger.error(f"Failed to open file: {error}")
                 return False
                 
         except Exception as e:
             logger.error(f"Error opening file: {e}")
             return False
     
+    def _spawn_vscode(self, args: List[str], timeout: float = _SPAWN_WAIT) -> Tuple[bool, str]:
+        """Launch the VS Code CLI detached; returns (ok, stderr) if it exits within timeout, else (True, '')"""
+        process = subprocess.Popen(
+            [self.vscode_command, *args],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            start_new_session=True
+        )
+        
+        try:
+            _, stderr = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            # Still starting up: assume success and let a reaper drain stderr and collect the exit
+            threading.Thread(target=self._reap_vscode, args=(process, args), daemon=True).start()
+            return True, ''
+        
+        return process.returncode == 0, stderr.decode(errors='replace')
+    
+    def _reap_vscode(self, process: subprocess.Popen, args: List[str]):
+        """Wait for a detached VS Code launch and log it if it failed"""
+        _, stderr = process.communicate()
+        if process.returncode != 0:
+            logger.error(f"VS Code command {args} failed: {stderr.decode(errors='replace').strip()}")
+    
     def create_file(self, file_path: str, content: str = "") -> bool:
         """Create a new file with optional content"""
         try:
@@ -117,6 +192,7 @@ class VSCodeIntegration:
             # Write content to file
             with open(file_path, 'w', encoding='utf-8') as f:
                 f.write(content)
+            self._dir_cache.pop(str(file_path.resolve().parent), None)
             
             # Open in VS Code
             self.open_file(str(file_path))
@@ -134,55 +210,87 @@ class VSCodeIntegration:
             return []
         
         try:
-            # Use grep to search for text
-            result = subprocess.run([
-                'grep', '-r', '-n', '--include=*.py', '--include=*.js', 
-                '--include=*.ts', '--include=*.html', '--include=*.css',
-                '--include=*.md', '--include=*.txt', '--include=*.json',
-                query, self.current_workspace
-            ], capture_output=True, text=True)
-            
-            matches = []
-            if result.stdout:
-                for line in result.stdout.strip().split('\n'):
-                    if ':' in line:
-                        parts = line.split(':', 2)
-                        if len(parts) >= 3:
-                            matches.append({
-                                'file': parts[0],
-                                'line': int(parts[1]) if parts[1].isdigit() else 0,
-                                'content': parts[2].strip()
-                            })
+            if self._rg_command:
+                matches = self._search_ripgrep(query)
+            else:
+                matches = self._search_grep(query)
             
             logger.info(f"Found {len(matches)} matches for '{query}'")
             return matches
             
+        except subprocess.TimeoutExpired:
+            logger.error(f"Search for '{query}' timed out after {_SEARCH_TIMEOUT:.0f}s")
+            return []
         except Exception as e:
             logger.error(f"Error searching workspace: {e}")
             return []
     
+    def _search_ripgrep(self, query: str) -> List[Dict[str, Any]]:
+        """Search with ripgrep's JSON output (one event object per line).
+        
+        Matches grep's behaviour: fixed-string query, hidden and .gitignore'd files included.
+        """
+        cmd = [self._rg_command, '--json', '--fixed-strings', '--hidden', '--no-ignore']
+        for extension in DEFAULT_EXTENSIONS:
+            cmd.extend(['--glob', f'*{extension}'])
+        cmd.extend(['-e', query, '--', self.current_workspace])
+        
+        result = subprocess.run(cmd, capture_output=True, timeout=_SEARCH_TIMEOUT)
+        _log_search_errors('rg', result)
+        loads = orjson.loads if orjson is not None else json.loads
+        
+        matches = []
+        for line in result.stdout.splitlines():
+            event = loads(line)
+            if event.get('type') != 'match':
+                continue
+            data = event['data']
+            path = data['path'].get('text')
+            content = data['lines'].get('text')
+            if path is None or content is None:
+                continue  # Non-UTF-8 path or line
+            matches.append({
+                'file': path,
+                'line': data.get('line_number') or 0,
+                'content': content.strip()
+            })
+        return matches
+    
+    def _search_grep(self, query: str) -> List[Dict[str, Any]]:
+        """Search with grep; -Z separates the path with NUL so colons in paths parse safely"""
+        cmd = ['grep', '-r', '-n', '-Z', '-F']
+        cmd.extend(f'--include=*{extension}' for extension in DEFAULT_EXTENSIONS)
+        cmd.extend(['-e', query, '--', self.current_workspace])
+        
+        result = subprocess.run(cmd, capture_output=True, text=True, errors='replace',
+                                timeout=_SEARCH_TIMEOUT)
+        _log_search_errors('grep', result)
+        
+        matches = []
+        for line in result.stdout.splitlines():
+            path, sep, rest = line.partition('\0')
+            if not sep:
+                continue
+            line_number, _, content = rest.partition(':')
+            matches.append({
+                'file': path,
+                'line': int(line_number) if line_number.isdigit() else 0,
+                'content': content.strip()
+            })
+        return matches
+    
     def get_workspace_files(self, extensions: Optional[List[str]] = None) -> List[str]:
         """Get list of files in the current workspace"""
         if not self.current_workspace:
             return []
         
         try:
-            workspace_path = Path(self.current_workspace)
-            files = []
-            
             # Default extensions if none specified
             if extensions is None:
-                extensions = ['.py', '.js', '.ts', '.html', '.css', '.md', '.txt', '.json']
+                extensions = DEFAULT_EXTENSIONS
             
-            # Walk through workspace directory
-            for file_path in workspace_path.rglob('*'):
-                if file_path.is_file():
-                    if any(file_path.suffix == ext for ext in extensions):
-                        # Skip hidden files and common ignore patterns
-                        if not any(part.startswith('.') for part in file_path.parts):
-                            if 'node_modules' not in file_path.parts:
-                                if '__pycache__' not in file_path.parts:
-                                    files.append(str(file_path))
+            # Walk the workspace, skipping ignored trees instead of filtering their files
+            files = list(self._scan_files(self.current_workspace, frozenset(extensions)))
             
             logger.info(f"Found {len(files)} files in workspace")
             return sorted(files)
@@ -191,20 +299,60 @@ class VSCodeIntegration:
             logger.error(f"Error getting workspace files: {e}")
             return []
     
+    def _scan_files(self, root: str, extensions: frozenset) -> Iterator[str]:
+        """Yield matching file paths under root, pruning ignored and hidden directories"""
+        pending = [root]
+        while pending:
+            files, subdirs = self._list_dir(pending.pop())
+            for path in files:
+                if os.path.splitext(path)[1] in extensions:
+                    yield path
+            pending.extend(subdirs)
+    
+    def _list_dir(self, dir_path: str) -> Tuple[List[str], List[str]]:
+        """(file paths, subdirectory paths) of a directory, re-read only when its mtime changes"""
+        try:
+            mtime = os.stat(dir_path).st_mtime_ns
+            cached = self._dir_cache.get(dir_path)
+            if cached is not None and cached[0] == mtime:
+                return cached[1], cached[2]
+            
+            files, subdirs = [], []
+            with os.scandir(dir_path) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if name.startswith('.') or name in _IGNORED_DIRS:
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        files.append(entry.path)
+            
+            self._dir_cache[dir_path] = (mtime, files, subdirs)
+            return files, subdirs
+            
+        except (PermissionError, FileNotFoundError) as e:
+            logger.debug(f"Skipping unreadable directory {dir_path}: {e}")
+            self._dir_cache.pop(dir_path, None)
+            return [], []
+    
+    def invalidate_cache(self):
+        """Forget cached directory listings"""
+        self._dir_cache.clear()
+    
     def run_terminal_command(self, command: str) -> Dict[str, Any]:
         """Run a command in VS Code's integrated terminal"""
         try:
-            # Open VS Code with terminal command
-            result = subprocess.run([
-                self.vscode_command,
+            # Open VS Code with terminal command; output appears in the VS Code terminal
+            ok, error = self._spawn_vscode([
                 '--command', f'workbench.action.terminal.sendSequence',
                 '--args', json.dumps({'text': f'{command}\n'})
-            ], capture_output=True, text=True)
+            ])
             
             return {
-                'success': result.returncode == 0,
-                'output': result.stdout,
-                'error': result.stderr
+                'success': ok,
+                'output': '',
+                'error': error
             }
             
         except Exception as e:
@@ -224,6 +372,7 @@ class VSCodeIntegration:
             ], capture_output=True, text=True)
             
             if result.returncode == 0:
+                self._extensions_cache = None
                 logger.info(f"Installed extension: {extension_id}")
                 return True
             else:
@@ -234,8 +383,12 @@ class VSCodeIntegration:
             logger.error(f"Error installing extension: {e}")
             return False
     
-    def get_installed_extensions(self) -> List[str]:
-        """Get list of installed VS Code extensions"""
+    def get_installed_extensions(self, refresh: bool = False) -> List[str]:
+        """Get list of installed VS Code extensions (cached for _EXTENSIONS_TTL seconds)"""
+        cached = self._extensions_cache
+        if not refresh and cached is not None and time.monotonic() - cached[0] < _EXTENSIONS_TTL:
+            return list(cached[1])
+        
         try:
             result = subprocess.run([
                 self.vscode_command,
@@ -243,8 +396,9 @@ class VSCodeIntegration:
             ], capture_output=True, text=True)
             
             if result.returncode == 0:
-                extensions = result.stdout.strip().split('\n')
-                return [ext for ext in extensions if ext]
+                extensions = [ext for ext in result.stdout.strip().split('\n') if ext]
+                self._extensions_cache = (time.monotonic(), extensions)
+                return list(extensions)
             else:
                 return []
                 
@@ -256,13 +410,12 @@ class VSCodeIntegration:
         """Format a document using VS Code's formatter"""
         try:
             # Open file and format
-            result = subprocess.run([
-                self.vscode_command,
+            ok, _ = self._spawn_vscode([
                 str(file_path),
                 '--command', 'editor.action.formatDocument'
-            ], capture_output=True, text=True)
+            ])
             
-            return result.returncode == 0
+            return ok
             
         except Exception as e:
             logger.error(f"Error formatting document: {e}")
@@ -274,19 +427,13 @@ class VSCodeIntegration:
             'vscode_available': self._is_vscode_available(),
             'vscode_command': self.vscode_command,
             'current_workspace': self.current_workspace,
-            'recent_files': self.recent_files,
+            'recent_files': list(reversed(self.recent_files)),  # Most recent first
             'installed_extensions': len(self.get_installed_extensions())
         }
     
     def _is_vscode_available(self) -> bool:
-        """Check if VS Code is available"""
-        try:
-            result = subprocess.run([
-                self.vscode_command, '--version'
-            ], capture_output=True, text=True, timeout=5)
-            return result.returncode == 0
-        except:
-            return False
+        """Check if VS Code is available (resolved once, on first use)"""
+        return self._vscode_available
 
 # Global VS Code integration instance
 vscode_integration = None
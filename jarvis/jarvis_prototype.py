@@ -10,7 +10,10 @@ import threading
 import signal
 import sys
 import os
+import re
+import random
 from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
 
 # Add the parent directory to the path so we can import jarvis modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -54,23 +57,23 @@ class JARVISPrototype:
         try:
             logger.info("Initializing JARVIS components...")
             
-            # Initialize ASR
-            logger.info("Loading ASR (Speech-to-Text) system...")
-            self.asr_manager = ASRManager()
+            # ASR, TTS and vision are independent model/device loads: run them concurrently
+            logger.info("Loading ASR (Speech-to-Text), TTS (Text-to-Speech) and vision systems...")
+            with ThreadPoolExecutor(max_workers=4, thread_name_prefix="JARVIS-Init") as executor:
+                asr_future = executor.submit(ASRManager)
+                tts_future = executor.submit(TTSManager)
+                vision_future = executor.submit(VisionManager)
+                analyzer_future = executor.submit(VisionAnalysisManager)
+                
+                self.asr_manager = asr_future.result()
+                self.tts_manager = tts_future.result()
+                self.vision_manager = vision_future.result()
+                self.vision_analyzer = analyzer_future.result()
             
-            # Initialize TTS
-            logger.info("Loading TTS (Text-to-Speech) system...")
-            self.tts_manager = TTSManager()
-            
-            # Initialize Audio I/O
+            # Initialize Audio I/O (its callback needs the speech managers)
             logger.info("Setting up audio input/output...")
             self.audio_manager = AudioManager(speech_callback=self._on_speech_detected)
 
-            # Initialize Vision System
-            logger.info("Setting up vision system...")
-            self.vision_manager = VisionManager()
-            self.vision_analyzer = VisionAnalysisManager()
-
             logger.info("JARVIS components initialized successfully!")
             
         except Exception as e:
@@ -122,58 +125,94 @@ class JARVISPrototype:
             play_error()  # Audio feedback for error
             logger.error(f"Error processing speech: {e}")
     
+    # Command keywords in priority order. Matched as plain substrings, as the
+    # original chain of `in` checks did, but in one regex pass over the text
+    _COMMAND_KEYWORDS = (
+        ('greet', ("hello", "hi", "hey", "jarvis")),
+        ('how_are_you', ("how are you",)),
+        ('time', ("what time", "time is it")),
+        ('weather', ("weather",)),
+        ('vision', ("camera", "vision", "see", "photo", "picture", "capture", "look")),
+        ('code', ("vs code", "code")),
+        ('stop', ("stop", "quit", "exit")),
+        ('status', ("status", "system")),
+        ('test', ("test",)),
+    )
+    _COMMAND_RE = re.compile("|".join(
+        f"(?P<{name}>{'|'.join(map(re.escape, words))})" for name, words in _COMMAND_KEYWORDS
+    ))
+    _COMMAND_PRIORITY = {name: i for i, (name, _) in enumerate(_COMMAND_KEYWORDS)}
+    _COMMAND_HANDLERS = {
+        'greet': '_greet_response',
+        'how_are_you': '_how_are_you_response',
+        'time': '_time_response',
+        'weather': '_weather_response',
+        'vision': '_handle_vision_command',
+        'code': '_code_response',
+        'stop': '_stop_response',
+        'status': '_status_response',
+        'test': '_test_response',
+    }
+    
     def _process_command(self, text: str) -> Optional[str]:
         """Process transcribed text and generate response"""
         text = text.lower().strip()
         
         # Enhanced command processing with better matching
         logger.info(f"Processing command: '{text}'")
-
-        if any(word in text for word in ["hello", "hi", "hey", "jarvis"]):
-            return "Hello! I'm JARVIS, your AI assistant. How can I help you today?"
-        
-        elif "how are you" in text:
-            return "I'm functioning optimally, thank you for asking. All systems are online."
-        
-        elif "what time" in text or "time is it" in text:
-            current_time = time.strftime("%I:%M %p")
-            return f"The current time is {current_time}."
-        
-        elif "weather" in text:
-            return "I don't have access to weather data yet, but I'm working on it. This feature will be available in a future update."
         
-        elif any(word in text for word in ["camera", "vision", "see", "photo", "picture", "capture", "look"]):
-            return self._handle_vision_command(text)
+        # Highest-priority rule with any keyword in the text wins
+        matched = {m.lastgroup for m in self._COMMAND_RE.finditer(text)}
+        if not matched:
+            return self._default_response(text)
         
-        elif "code" in text or "vs code" in text:
-            return "VS Code integration is planned for Phase 4. I'll be able to help with your coding projects soon."
-        
-        elif "stop" in text or "quit" in text or "exit" in text:
-            self.stop()
-            return "Goodbye! JARVIS is shutting down."
-        
-        elif "status" in text or "system" in text:
-            return self._get_system_status()
-        
-        elif "test" in text:
-            return "Test successful! Speech recognition and text-to-speech are working properly."
+        rule = min(matched, key=self._COMMAND_PRIORITY.__getitem__)
+        return getattr(self, self._COMMAND_HANDLERS[rule])(text)
+    
+    def _greet_response(self, text: str) -> str:
+        return "Hello! I'm JARVIS, your AI assistant. How can I help you today?"
+    
+    def _how_are_you_response(self, text: str) -> str:
+        return "I'm functioning optimally, thank you for asking. All systems are online."
+    
+    def _time_response(self, text: str) -> str:
+        current_time = time.strftime("%I:%M %p")
+        return f"The current time is {current_time}."
+    
+    def _weather_response(self, text: str) -> str:
+        return "I don't have access to weather data yet, but I'm working on it. This feature will be available in a future update."
+    
+    def _code_response(self, text: str) -> str:
+        return "VS Code integration is planned for Phase 4. I'll be able to help with your coding projects soon."
+    
+    def _stop_response(self, text: str) -> str:
+        self.stop()
+        return "Goodbye! JARVIS is shutting down."
+    
+    def _status_response(self, text: str) -> str:
+        return self._get_system_status()
+    
+    def _test_response(self, text: str) -> str:
+        return "Test successful! Speech recognition and text-to-speech are working properly."
+    
+    def _default_response(self, text: str) -> str:
+        """Default response for unrecognized commands"""
+        responses = [
+            "I heard you say: " + text + ". I'm still learning, so I might not understand everything yet.",
+            "That's interesting. I'm a prototype, so my responses are limited right now.",
+            "I'm processing what you said: " + text + ". More capabilities are coming soon!",
+            "I understand you're talking about: " + text + ". Let me know if you need help with something specific."
+        ]
         
-        else:
-            # Default response for unrecognized commands
-            responses = [
-                "I heard you say: " + text + ". I'm still learning, so I might not understand everything yet.",
-                "That's interesting. I'm a prototype, so my responses are limited right now.",
-                "I'm processing what you said: " + text + ". More capabilities are coming soon!",
-                "I understand you're talking about: " + text + ". Let me know if you need help with something specific."
-            ]
-            
-            import random
-            return random.choice(responses)
+        return random.choice(responses)
 
+    # Vision sub-commands, each one regex over the already-normalized text
+    _VISION_CAPTURE_RE = re.compile("take photo|take picture|capture")
+    _VISION_DESCRIBE_RE = re.compile("what do you see|describe|look")
+    _VISION_STOP_RE = re.compile("stop camera|close camera")
+    
     def _handle_vision_command(self, text: str) -> str:
-        """Handle vision-related commands"""
-        text = text.lower()
-
+        """Handle vision-related commands (text is already lowercased and stripped)"""
         try:
             # Start camera if not already active
             if not self.vision_manager.is_monitoring:
@@ -181,7 +220,7 @@ class JARVISPrototype:
                 if not self.vision_manager.start_vision_system():
                     return "I'm sorry, I couldn't access the camera. Please check if a camera is connected."
 
-            if "take photo" in text or "take picture" in text or "capture" in text:
+            if self._VISION_CAPTURE_RE.search(text):
                 play_camera_click()  # Camera shutter sound
                 photo_path = self.vision_manager.take_photo()
                 if photo_path:
@@ -191,7 +230,7 @@ class JARVISPrototype:
                     play_error()  # Error sound
                     return "I couldn't take a photo right now. Please try again."
 
-            elif "what do you see" in text or "describe" in text or "look" in text:
+            elif self._VISION_DESCRIBE_RE.search(text):
                 frame = self.vision_manager.camera.get_current_frame()
                 if frame is not None:
                     description = self.vision_analyzer.analyze_current_view(frame)
@@ -199,7 +238,7 @@ class JARVISPrototype:
                 else:
                     return "I can't see anything right now. The camera might not be working properly."
 
-            elif "stop camera" in text or "close camera" in text:
+            elif self._VISION_STOP_RE.search(text):
                 self.vision_manager.stop_vision_system()
                 return "Camera system stopped."
 
@@ -260,6 +260,10 @@ def main():
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
     
+    # Configuration is final once components start binding values from it
+    from jarvis.config.config import freeze_config
+    freeze_config()
+    
     # Create and run JARVIS system
     global jarvis_system
     jarvis_system = RobustJARVISSystem()
@@ -80,11 +80,14 @@ def test_memory_manager_direct():
         else:
             print("  ❌ Export failed")
         
-        # Clean up test database
+        # Clean up test database (close first so no WAL sidecar files are left behind)
         import os
-        if os.path.exists("test_memory.db"):
-            os.remove("test_memory.db")
-            print("  🧹 Test database cleaned up")
+        memory_manager.close()
+        for path in ("test_memory.db", "test_memory.db-wal", "test_memory.db-shm",
+                     "test_conversations.json"):
+            if os.path.exists(path):
+                os.remove(path)
+        print("  🧹 Test database cleaned up")
         
         print("\n🎉 All memory manager tests completed successfully!")
         return True
@@ -3,6 +3,7 @@
 Test script for JARVIS Memory System
 """
 
+import os
 import sys
 import time
 from pathlib import Path
@@ -95,6 +96,7 @@ def test_memory_system():
         export_success = memory_manager.export_conversations("test_conversations.json", "json")
         if export_success:
             print("  ✅ Conversations exported to test_conversations.json")
+            os.remove("test_conversations.json")
         else:
             print("  ❌ Export failed")
         
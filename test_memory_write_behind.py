@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Regression tests for MemoryManager's write-behind persistence
+"""
+
+import sys
+from pathlib import Path
+
+# Add current directory to path
+sys.path.append(str(Path(__file__).parent))
+
+from jarvis.core.memory_manager import MemoryManager, _WRITE_BATCH_ROWS
+
+
+def _manager(tmp_path):
+    return MemoryManager(str(tmp_path / "memory" / "conversations.db"))
+
+
+def test_read_after_write_without_flush(tmp_path):
+    """Reads see queued writes without an explicit flush"""
+    memory_manager = _manager(tmp_path)
+    try:
+        memory_manager.store_conversation("Hello JARVIS", "Hello!", context={"mood": "calm"},
+                                          session_id="s1", command_type="test")
+
+        recent = memory_manager.get_recent_conversations(limit=5)
+        assert [conv['user_input'] for conv in recent] == ["Hello JARVIS"]
+        assert recent[0]['context'] == {"mood": "calm"}
+        assert "Hello JARVIS" in memory_manager.get_conversation_context(session_id="s1")
+    finally:
+        memory_manager.close()
+
+
+def test_batched_writes_survive_reopen(tmp_path):
+    """Writes spanning several batches are all committed by close()"""
+    total = _WRITE_BATCH_ROWS * 2 + 10
+    memory_manager = _manager(tmp_path)
+    for i in range(total):
+        memory_manager.store_conversation(f"command {i}", f"response {i}", command_type="test")
+    memory_manager.update_preference("user_name", "John")
+    memory_manager.close()
+
+    reopened = _manager(tmp_path)
+    try:
+        recent = reopened.get_recent_conversations(limit=total + 1, parse_context=False)
+        assert len(recent) == total
+        assert reopened.get_preference("user_name") == "John"
+    finally:
+        reopened.close()
+
+
+def test_preference_update_visible_immediately(tmp_path):
+    """Cached preferences reflect an update before the writer commits it"""
+    memory_manager = _manager(tmp_path)
+    try:
+        memory_manager.update_preference("theme", "dark")
+        assert memory_manager.get_preference("theme") == "dark"
+
+        memory_manager.update_preference("theme", "light")
+        assert memory_manager.get_user_preferences() == {"theme": "light"}
+    finally:
+        memory_manager.close()
+
+
+def test_bad_row_does_not_drop_its_batch(tmp_path):
+    """A write that violates a constraint loses only itself, not the rest of its batch"""
+    memory_manager = _manager(tmp_path)
+    try:
+        memory_manager.store_conversation("hello", "hi")
+        memory_manager.update_preference("name", None)  # preference_value is NOT NULL
+        memory_manager.store_conversation("second", "there")
+
+        recent = memory_manager.get_recent_conversations(limit=5)
+        assert sorted(conv['user_input'] for conv in recent) == ["hello", "second"]
+    finally:
+        memory_manager.close()
+
+
+def test_flush_commits_queue(tmp_path):
+    """flush() returns only once every queued write is committed"""
+    memory_manager = _manager(tmp_path)
+    try:
+        memory_manager.log_system_event("camera_error", {"index": 0}, severity="error")
+        memory_manager.store_conversation("ping", "pong")
+        assert memory_manager.flush()
+        assert memory_manager._write_q.unfinished_tasks == 0
+    finally:
+        memory_manager.close()
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Regression tests for the near-duplicate prompt cache behind get_smart_response
+"""
+
+import sys
+import zlib
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add current directory to path
+sys.path.append(str(Path(__file__).parent))
+
+pytest.importorskip("openai")
+
+from jarvis.integrations import openai_integration
+from jarvis.integrations.openai_integration import OpenAIIntegration, _SemanticCache
+
+
+def _fake_embed(text: str) -> np.ndarray:
+    """Deterministic bag-of-words embedding: reworded prompts with the same words match"""
+    vector = np.zeros(64, dtype=np.float32)
+    for word in text.lower().replace('?', ' ').split():
+        if not word.isdigit():
+            vector[zlib.crc32(word.encode()) % 64] += 1.0
+    return vector / np.linalg.norm(vector)
+
+
+@pytest.fixture
+def jarvis(monkeypatch):
+    monkeypatch.setattr(openai_integration, "_embed", _fake_embed)
+    integration = OpenAIIntegration()
+    integration._get_current_time = lambda: "2026-01-01 12:00:00"
+
+    calls = []
+
+    def fake_chat(message, context=None, temperature=0.7, cacheable=False):
+        calls.append(message)
+        response = f"answer {len(calls)}"
+        integration._remember(integration._with_context(message, context), response)
+        return response
+
+    integration.chat = fake_chat
+    integration.calls = calls
+    return integration
+
+
+def test_construction_does_not_load_embedder(monkeypatch):
+    monkeypatch.setattr(openai_integration, "_embedder_warmup_started", False)
+    OpenAIIntegration()
+    assert not openai_integration._embedder_warmup_started
+
+
+def test_reworded_prompt_hits_as_conversation_grows(jarvis):
+    first = jarvis.get_smart_response("what is the capital of France")
+    # The first exchange is now in the history; the cached answer still applies
+    assert jarvis.get_smart_response("What is the capital of France?") == first
+    assert len(jarvis.calls) == 1
+
+
+def test_hit_is_remembered_like_a_miss(jarvis):
+    jarvis.get_smart_response("what is the capital of France")
+    miss_entry = jarvis.conversation_history[-1]
+
+    jarvis.get_smart_response("what is the capital of France")
+    assert jarvis.conversation_history[-1] == miss_entry
+    assert miss_entry["user"].startswith("Context: ")
+
+
+def test_clock_fields_do_not_defeat_the_cache(jarvis):
+    context = {"audio_available": True, "camera_available": False}
+    jarvis.get_smart_response("tell me a fun fact about space",
+                              system_context={**context, "current_time": "2026-01-01 12:00:00"})
+    jarvis.get_smart_response("tell me a fun fact about space",
+                              system_context={**context, "current_time": "2026-01-01 12:00:07"})
+    assert len(jarvis.calls) == 1
+
+
+def test_different_system_context_misses(jarvis):
+    jarvis.get_smart_response("describe what you can see", system_context={"camera_available": True})
+    jarvis.get_smart_response("describe what you can see", system_context={"camera_available": False})
+    assert len(jarvis.calls) == 2
+
+
+def test_different_numbers_miss(jarvis):
+    jarvis.get_smart_response("what is 5 plus 7")
+    assert jarvis.get_smart_response("what is 5 plus 8") != "answer 1"
+    assert len(jarvis.calls) == 2
+
+
+def test_cache_expires_and_evicts_least_recently_used():
+    guard = ((), "ctx")
+    a, b, c = (np.eye(3, dtype=np.float32)[i] for i in range(3))
+
+    cache = _SemanticCache(size=2, ttl=300.0)
+    cache.put(a, guard, "a")
+    cache.put(b, guard, "b")
+    assert cache.get(a, guard) == "a"  # a is now more recently used than b
+    cache.put(c, guard, "c")
+    assert cache.get(b, guard) is None
+    assert cache.get(a, guard) == "a" and cache.get(c, guard) == "c"
+
+    expired = _SemanticCache(ttl=-1.0)
+    expired.put(a, guard, "a")
+    assert expired.get(a, guard) is None
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
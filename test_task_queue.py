@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Regression tests for TaskQueue priority dispatch and retry scheduling
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# Add current directory to path
+sys.path.append(str(Path(__file__).parent))
+
+from jarvis.core.task_queue import Task, TaskQueue, TaskPriority, TaskStatus, TaskType
+
+
+@pytest.fixture
+def queue():
+    task_queue = TaskQueue(max_workers=1)  # One worker runs tasks in dispatch order
+    yield task_queue
+    task_queue.stop(timeout=1.0)  # The monitor sleeps between checks; don't wait it out
+
+
+def _submit(task_queue, function, retry_delay=0.01, **kwargs):
+    """Submit before start() and shorten the retry backoff so tests stay fast"""
+    task_id = task_queue.submit_task(TaskType.SYSTEM_STATUS, function, **kwargs)
+    task_queue.unfinished_tasks[task_id].retry_delay = retry_delay
+    return task_id
+
+
+def test_dispatch_follows_priority_then_fifo(queue):
+    order = []
+    submitted = [
+        ('low', TaskPriority.LOW),
+        ('normal-1', TaskPriority.NORMAL),
+        ('critical', TaskPriority.CRITICAL),
+        ('normal-2', TaskPriority.NORMAL),
+        ('background', TaskPriority.BACKGROUND),
+        ('high', TaskPriority.HIGH),
+    ]
+    task_ids = [_submit(queue, order.append, args=(name,), priority=priority)
+                for name, priority in submitted]
+
+    queue.start()
+    for task_id in task_ids:
+        assert queue.wait_task(task_id, 5.0)[0] == TaskStatus.COMPLETED
+
+    assert order == ['critical', 'high', 'normal-1', 'normal-2', 'low', 'background']
+
+
+def test_failed_task_is_retried_until_success(queue):
+    calls = []
+
+    def flaky():
+        calls.append(threading.get_ident())
+        if len(calls) < 3:
+            raise RuntimeError("transient")
+        return "done"
+
+    task_id = _submit(queue, flaky, max_retries=3)
+    queue.start()
+
+    assert queue.wait_task(task_id, 5.0) == (TaskStatus.COMPLETED, "done")
+    assert len(calls) == 3
+    stats = queue.get_queue_stats()
+    assert stats['retried_tasks'] == 2
+    assert stats['completed_tasks'] == 1
+    assert stats['failed_tasks'] == 0
+    assert not queue._retry_heap
+
+
+def test_retries_exhausted_marks_failed_once(queue):
+    errors = []
+
+    def always_fails():
+        raise ValueError("permanent")
+
+    task_id = _submit(queue, always_fails, max_retries=2, error_callback=errors.append)
+    queue.start()
+
+    assert queue.wait_task(task_id, 5.0) == (TaskStatus.FAILED, None)
+    assert len(errors) == 1 and isinstance(errors[0], ValueError)
+    assert queue.failed_tasks[task_id].attempts == 2
+    assert queue.get_task_status(task_id) == TaskStatus.FAILED
+    assert queue.get_queue_stats()['retried_tasks'] == 1
+
+
+def test_retry_waits_out_backoff_without_blocking_other_tasks(queue):
+    release = threading.Event()
+    attempts = []
+
+    def fails_first():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("transient")
+        return "retried"
+
+    retry_id = _submit(queue, fails_first, retry_delay=0.5, max_retries=2)
+    queue.start()
+
+    # While the retry sits in its backoff, later work still runs
+    other_id = queue.submit_task(TaskType.SYSTEM_STATUS, release.set)
+    assert queue.wait_task(other_id, 5.0)[0] == TaskStatus.COMPLETED
+    assert release.is_set()
+
+    assert queue.wait_task(retry_id, 5.0) == (TaskStatus.COMPLETED, "retried")
+
+
+def test_retry_delay_is_capped_exponential_with_jitter():
+    task_queue = TaskQueue(max_workers=1)
+    task = Task(retry_delay=1.0, max_retry_delay=4.0)
+    for attempts, window in [(1, 1.0), (2, 2.0), (3, 4.0), (6, 4.0)]:
+        task.attempts = attempts
+        delays = [task_queue._retry_delay(task) for _ in range(200)]
+        assert all(0.0 <= delay <= window for delay in delays)
+        assert max(delays) > window / 2  # Jitter spans the window rather than sitting at 0
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Regression tests for VS Code workspace search (ripgrep and grep backends)
+"""
+
+import logging
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add current directory to path
+sys.path.append(str(Path(__file__).parent))
+
+from jarvis.integrations import vscode_integration
+from jarvis.integrations.vscode_integration import VSCodeIntegration
+
+BACKENDS = [
+    pytest.param('_search_grep', id='grep',
+                 marks=pytest.mark.skipif(shutil.which('grep') is None, reason="grep not installed")),
+    pytest.param('_search_ripgrep', id='rg',
+                 marks=pytest.mark.skipif(shutil.which('rg') is None, reason="ripgrep not installed")),
+]
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    (tmp_path / "main.py").write_text("result = a.b(c)\nabbc = 1\n")
+    (tmp_path / "notes.bin").write_text("a.b(c)\n")  # Extension outside DEFAULT_EXTENSIONS
+    (tmp_path / ".hidden").mkdir()
+    (tmp_path / ".hidden" / "secret.py").write_text("a.b(c)\n")
+    (tmp_path / "ignored").mkdir()
+    (tmp_path / "ignored" / "build.js").write_text("a.b(c)\n")
+    (tmp_path / ".gitignore").write_text("ignored/\n")
+
+    integration = VSCodeIntegration()
+    integration.current_workspace = str(tmp_path)
+    return integration
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_query_is_a_fixed_string(workspace, backend):
+    # As a regex "a.b(c)" would also match "abbc" (grep BRE) or fail to parse (rg)
+    matches = getattr(workspace, backend)("a.b(c)")
+    main = [m for m in matches if m['file'].endswith("main.py")]
+    assert main == [{'file': str(Path(workspace.current_workspace) / "main.py"),
+                     'line': 1, 'content': "result = a.b(c)"}]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_backends_search_the_same_files(workspace, backend):
+    files = {Path(m['file']).name for m in getattr(workspace, backend)("a.b(c)")}
+    assert files == {"main.py", "secret.py", "build.js"}
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_failure_is_logged(workspace, backend, caplog):
+    workspace.current_workspace = str(Path(workspace.current_workspace) / "missing")
+    with caplog.at_level(logging.ERROR, logger=vscode_integration.__name__):
+        assert getattr(workspace, backend)("a.b(c)") == []
+    assert "search failed (exit 2)" in caplog.text
+
+
+def test_timeout_returns_no_matches(workspace, monkeypatch, caplog):
+    def slow_run(cmd, **kwargs):
+        raise subprocess.TimeoutExpired(cmd, kwargs['timeout'])
+
+    monkeypatch.setattr(vscode_integration.subprocess, "run", slow_run)
+    with caplog.at_level(logging.ERROR, logger=vscode_integration.__name__):
+        assert workspace.search_in_workspace("a.b(c)") == []
+    assert "timed out" in caplog.text
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))